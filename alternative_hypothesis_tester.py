@@ -19,13 +19,21 @@ import os
 import sys
 import json
 import subprocess
-import statistics
 import numpy as np
-from scipy import stats
+from scipy import special, stats
 from typing import Dict, List, Tuple, Optional
 import logging
-from dataclasses import dataclass
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 @dataclass
 class HypothesisTest:
@@ -40,31 +48,183 @@ class HypothesisTest:
 
 @dataclass
 class VideoAnalysisResult:
-    """Results from video analysis for hypothesis testing."""
+    """
+    Results from video analysis for hypothesis testing.
+    
+    Per-frame measurements are stored as parallel NumPy arrays (struct of
+    arrays) so comparisons can feed them straight into vectorized routines.
+    Ratios and magnitudes are kept in float32 and upcast only where a test
+    needs float64.
+    """
     filename: str
     metadata: Dict
-    compression_ratios: List[float]
-    frame_discontinuities: List[Dict]
-    adobe_signatures: List[str]
-    timestamp_anomalies: List[Dict]
+    compression_ratios: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float32))
+    discontinuity_frames: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int32))
+    discontinuity_magnitudes: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float32))
+    adobe_signatures: List[str] = field(default_factory=list)
+    timestamp_anomaly_offsets: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    
+    def __post_init__(self):
+        self.compression_ratios = np.asarray(self.compression_ratios, dtype=np.float32)
+        self.discontinuity_frames = np.asarray(self.discontinuity_frames, dtype=np.int32)
+        self.discontinuity_magnitudes = np.asarray(self.discontinuity_magnitudes, dtype=np.float32)
+        self.timestamp_anomaly_offsets = np.asarray(self.timestamp_anomaly_offsets, dtype=np.float64)
+
+@lru_cache(maxsize=32)
+def _probe_video_cached(video_path: str, mtime: float, size: int) -> Dict:
+    """Run ffprobe once per (path, mtime, size) and return the parsed output."""
+    cmd = [
+        'ffprobe', '-v', 'quiet', '-print_format', 'json',
+        '-show_format', '-show_streams', video_path
+    ]
+    
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return json.loads(result.stdout)
+    except (OSError, subprocess.CalledProcessError, json.JSONDecodeError):
+        return {}
+
+def probe_video(video_path: str) -> Dict:
+    """
+    Return ffprobe format/stream metadata for a video.
+    
+    Results are memoized and keyed on the file's modification time and size,
+    so an edited file is probed again. The returned dict is shared between
+    callers and must be treated as read-only.
+    """
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        return {}
+    return _probe_video_cached(video_path, stat.st_mtime, stat.st_size)
+
+@lru_cache(maxsize=32)
+def _analyze_video_cached(video_path: str, mtime: float, size: int) -> VideoAnalysisResult:
+    """Analyze a video once per (path, mtime, size)."""
+    # Placeholder implementation beyond container metadata
+    return VideoAnalysisResult(
+        filename=video_path,
+        metadata=dict(_probe_video_cached(video_path, mtime, size))
+    )
+
+def analyze_video(video_path: str) -> VideoAnalysisResult:
+    """
+    Perform comprehensive analysis of a single video.
+    
+    Memoized like probe_video, so the result is shared between callers and
+    must be treated as read-only.
+    """
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        return VideoAnalysisResult(filename=video_path, metadata={})
+    return _analyze_video_cached(video_path, stat.st_mtime, stat.st_size)
+
+class _NumpyJSONEncoder(json.JSONEncoder):
+    """Stdlib JSON fallback that understands NumPy scalars and arrays."""
+    
+    def default(self, obj):
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        return super().default(obj)
+
+def _pearson_r(a: np.ndarray, b: np.ndarray, axis: int = -1):
+    """
+    Two-pass Pearson correlation along ``axis``.
+    
+    Works on single series or on stacked batches of series, so callers can
+    correlate many pairs in one vectorized pass. float32 inputs stay float32
+    in memory while means and sums accumulate in float64. Constant series
+    yield 0.0.
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    a_centered = a - a.mean(axis=axis, keepdims=True, dtype=np.float64).astype(a.dtype)
+    b_centered = b - b.mean(axis=axis, keepdims=True, dtype=np.float64).astype(b.dtype)
+    
+    covariance = (a_centered * b_centered).sum(axis=axis, dtype=np.float64)
+    scale = np.sqrt((a_centered * a_centered).sum(axis=axis, dtype=np.float64) *
+                    (b_centered * b_centered).sum(axis=axis, dtype=np.float64))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = np.where(scale > 0, covariance / scale, 0.0)
+    return r if r.ndim else float(r)
+
+# Hypothesis calculations below are pure functions of a few scalars, kept at
+# module level. Only the p-value, which evaluates the t distribution, is
+# cached; the probability is two comparisons, cheaper than a cache lookup.
+
+def _hardware_probability(dynamic_bitrate_changes: int, correlation_coefficient: float) -> float:
+    """Probability of the hardware encoding hypothesis from its evidence scalars."""
+    # Simplified calculation - real implementation would be more sophisticated
+    base_probability = 0.3
+    
+    # Adjust based on evidence
+    if dynamic_bitrate_changes > 5:
+        base_probability += 0.2
+    if correlation_coefficient > 0.7:
+        base_probability += 0.2
+        
+    return min(base_probability, 0.9)
+
+@lru_cache(maxsize=256)
+def _correlation_p_value(observed: float, n_samples: int) -> float:
+    """
+    Two-sided p-value for a Pearson correlation under the null of independence.
+    
+    Uses the exact null distribution of r: t = r * sqrt((n - 2) / (1 - r^2))
+    follows Student's t with n - 2 degrees of freedom, so the cost does not
+    grow with the number of frames.
+    """
+    if n_samples < 3 or not np.isfinite(observed):
+        return 1.0
+        
+    r = min(abs(observed), 1.0)
+    if r == 1.0:
+        return 0.0
+        
+    dof = n_samples - 2
+    t = r * np.sqrt(dof / (1.0 - r * r))
+    return float(2.0 * special.stdtr(dof, -t))
+
+# Correlation evidence behind each hypothesis p-value:
+# hypothesis type -> (test_results key, correlation field, sample-size field)
+_P_VALUE_EVIDENCE = {
+    'hardware_encoding': ('motion_correlations', 'correlation_coefficient', 'motion_events'),
+}
 
 class AlternativeHypothesisTester:
     """
     Framework for testing alternative explanations for video artifacts.
     """
     
+    # Output subdirectories created under output_dir
+    OUTPUT_SUBDIRECTORIES = (
+        "baseline_data",
+        "test_results",
+        "statistical_analysis",
+        "comparative_analysis"
+    )
+    
     def __init__(self, output_dir: str = "hypothesis_testing_output"):
-        self.output_dir = output_dir
-        self.setup_logging()
+        self.output_dir = Path(output_dir)
         self.setup_directories()
+        self.setup_logging()
         
         # Hypothesis registry
         self.hypotheses = []
         self.test_results = {}
+        self._results_lock = threading.Lock()
         
         # Statistical thresholds
         self.significance_level = 0.05
         self.confidence_level = 0.95
+        self._z = float(special.ndtri(1 - (1 - self.confidence_level) / 2))
+        
+        # Pseudo sample size behind probability estimates; 96 puts the
+        # widest (p = 0.5) 95% interval at +/-0.10
+        self.effective_sample_size = 96
         
     def setup_logging(self):
         """Configure logging for hypothesis testing."""
@@ -72,7 +232,7 @@ class AlternativeHypothesisTester:
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler(f'{self.output_dir}/hypothesis_testing.log'),
+                logging.FileHandler(str(self.output_dir / 'hypothesis_testing.log'), delay=True),
                 logging.StreamHandler()
             ]
         )
@@ -80,16 +240,9 @@ class AlternativeHypothesisTester:
         
     def setup_directories(self):
         """Create necessary directories for testing output."""
-        directories = [
-            self.output_dir,
-            f"{self.output_dir}/baseline_data",
-            f"{self.output_dir}/test_results",
-            f"{self.output_dir}/statistical_analysis",
-            f"{self.output_dir}/comparative_analysis"
-        ]
-        
-        for directory in directories:
-            os.makedirs(directory, exist_ok=True)
+        # parents=True creates output_dir itself with the first subdirectory
+        for subdirectory in self.OUTPUT_SUBDIRECTORIES:
+            (self.output_dir / subdirectory).mkdir(parents=True, exist_ok=True)
             
     def register_hypothesis(self, name: str, description: str, test_function):
         """Register a new alternative hypothesis for testing."""
@@ -253,9 +406,16 @@ class AlternativeHypothesisTester:
             test_results=test_results
         )
         
-    def compare_with_baseline(self, video_path: str, baseline_videos: List[str]) -> Dict:
+    def compare_with_baseline(self, video_path: str, baseline_videos: List[str],
+                              workers: int = 1) -> Dict:
         """
         Compare target video with known unedited baseline videos.
+        
+        Args:
+            video_path: Path to target video
+            baseline_videos: Paths to known unedited videos
+            workers: Worker threads for baseline analysis; 1 (the default)
+                analyzes them inline, -1 uses one thread per CPU
         """
         self.logger.info("Performing baseline comparison analysis...")
         
@@ -263,12 +423,9 @@ class AlternativeHypothesisTester:
         target_analysis = self._analyze_video_comprehensive(video_path)
         
         # Analyze baseline videos
-        baseline_analyses = []
-        for baseline_video in baseline_videos:
-            if os.path.exists(baseline_video):
-                analysis = self._analyze_video_comprehensive(baseline_video)
-                baseline_analyses.append(analysis)
-                
+        existing_baselines = [v for v in baseline_videos if os.path.exists(v)]
+        baseline_analyses = self._analyze_videos_parallel(existing_baselines, workers)
+        
         # Statistical comparison
         comparison_results = self._perform_statistical_comparison(
             target_analysis, baseline_analyses
@@ -290,24 +447,24 @@ class AlternativeHypothesisTester:
             'overall_assessment': None
         }
         
-        # Test all hypotheses
-        hypothesis_tests = [
-            self.test_hardware_encoding_hypothesis(video_path),
-            self.test_network_transmission_hypothesis(video_path),
-            self.test_storage_system_hypothesis(video_path),
-            self.test_environmental_factors_hypothesis(video_path)
-        ]
+        # Test all hypotheses concurrently; each branch is dominated by
+        # subprocess I/O on the same video, so threads overlap the waits
+        hypothesis_functions = (
+            self.test_hardware_encoding_hypothesis,
+            self.test_network_transmission_hypothesis,
+            self.test_storage_system_hypothesis,
+            self.test_environmental_factors_hypothesis
+        )
+        
+        with ThreadPoolExecutor(max_workers=len(hypothesis_functions)) as executor:
+            futures = [
+                executor.submit(self._run_hypothesis_test, test_function, video_path)
+                for test_function in hypothesis_functions
+            ]
+            hypothesis_tests = [future.result() for future in futures]
         
         results['hypothesis_tests'] = [
-            {
-                'name': test.name,
-                'description': test.description,
-                'probability': test.probability,
-                'confidence_interval': test.confidence_interval,
-                'p_value': test.p_value,
-                'evidence': test.evidence,
-                'significant': test.p_value < self.significance_level
-            }
+            {**asdict(test), 'significant': test.p_value < self.significance_level}
             for test in hypothesis_tests
         ]
         
@@ -327,6 +484,13 @@ class AlternativeHypothesisTester:
         
         return results
         
+    def _run_hypothesis_test(self, test_function, video_path: str) -> HypothesisTest:
+        """Run a single hypothesis test and record its result."""
+        test = test_function(video_path)
+        with self._results_lock:
+            self.test_results[test.name] = test
+        return test
+        
     def _analyze_encoding_variations(self, video_path: str) -> Dict:
         """Analyze encoding parameter variations in video."""
         # Implementation would analyze bitrate changes, codec parameters, etc.
@@ -336,13 +500,35 @@ class AlternativeHypothesisTester:
             'quality_adjustments': 1
         }
         
-    def _analyze_motion_encoding_correlation(self, video_path: str) -> Dict:
-        """Analyze correlation between motion and encoding changes."""
-        # Implementation would correlate motion vectors with encoding changes
+    def _analyze_motion_encoding_correlation(self, video_path: str,
+                                             motion_magnitudes: Optional[np.ndarray] = None,
+                                             bitrate_deltas: Optional[np.ndarray] = None) -> Dict:
+        """
+        Analyze correlation between motion and encoding changes.
+        
+        Args:
+            video_path: Path to video file
+            motion_magnitudes: Per-frame motion-vector magnitudes
+            bitrate_deltas: Per-frame bitrate deltas aligned with motion_magnitudes
+        """
+        if motion_magnitudes is not None and bitrate_deltas is not None:
+            motion = np.asarray(motion_magnitudes, dtype=np.float32)
+            deltas = np.asarray(bitrate_deltas, dtype=np.float32)
+            n_frames = min(motion.size, deltas.size)
+            return {
+                'correlation_coefficient': _pearson_r(motion[:n_frames], deltas[:n_frames]) if n_frames > 1 else 0.0,
+                'motion_events': int(n_frames),
+                'encoding_changes': int(np.count_nonzero(deltas[:n_frames])),
+                'measured': True
+            }
+            
+        # Implementation would extract motion vectors and encoding changes;
+        # 'measured' keeps these placeholder values out of the p-value
         return {
             'correlation_coefficient': 0.65,
             'motion_events': 12,
-            'encoding_changes': 8
+            'encoding_changes': 8,
+            'measured': False
         }
         
     def _analyze_scene_complexity_effects(self, video_path: str) -> Dict:
@@ -356,16 +542,10 @@ class AlternativeHypothesisTester:
         
     def _calculate_hardware_probability(self, test_results: Dict) -> float:
         """Calculate probability for hardware encoding hypothesis."""
-        # Simplified calculation - real implementation would be more sophisticated
-        base_probability = 0.3
-        
-        # Adjust based on evidence
-        if test_results['encoding_variations']['dynamic_bitrate_changes'] > 5:
-            base_probability += 0.2
-        if test_results['motion_correlations']['correlation_coefficient'] > 0.7:
-            base_probability += 0.2
-            
-        return min(base_probability, 0.9)
+        return _hardware_probability(
+            test_results['encoding_variations']['dynamic_bitrate_changes'],
+            float(test_results['motion_correlations']['correlation_coefficient'])
+        )
         
     def _calculate_network_probability(self, test_results: Dict) -> float:
         """Calculate probability for network transmission hypothesis."""
@@ -380,14 +560,49 @@ class AlternativeHypothesisTester:
         return 0.35  # Placeholder
         
     def _calculate_p_value(self, test_results: Dict, hypothesis_type: str) -> float:
-        """Calculate p-value for hypothesis test."""
-        # Simplified p-value calculation
-        return 0.12  # Placeholder
+        """
+        Calculate p-value for hypothesis test.
+        
+        Hypotheses backed by a correlation measurement are tested against the
+        null of independent series with the exact t test for Pearson r.
+        Hypotheses without such a measurement, or whose measurement is a
+        placeholder (not flagged 'measured'), report 1.0, i.e. no evidence
+        against the null.
+        """
+        evidence = _P_VALUE_EVIDENCE.get(hypothesis_type)
+        if evidence is None:
+            return 1.0
+            
+        result_key, correlation_key, count_key = evidence
+        measurement = test_results.get(result_key, {})
+        if not measurement.get('measured', False):
+            return 1.0
+        if correlation_key not in measurement or count_key not in measurement:
+            return 1.0
+            
+        return _correlation_p_value(
+            float(measurement[correlation_key]), int(measurement[count_key])
+        )
+        
+    def _calculate_confidence_interval(self, probability):
+        """
+        Calculate Wald confidence interval(s) for probability estimates.
+        
+        Args:
+            probability: A single probability or an array of probabilities
+            
+        Returns:
+            (lower, upper) as floats for a scalar input, or as arrays
+            matching the input shape, clipped to [0, 1]
+        """
+        p = np.asarray(probability, dtype=np.float64)
+        margin = self._z * np.sqrt(p * (1 - p) / self.effective_sample_size)
+        lower = np.clip(p - margin, 0.0, 1.0)
+        upper = np.clip(p + margin, 0.0, 1.0)
         
-    def _calculate_confidence_interval(self, probability: float) -> Tuple[float, float]:
-        """Calculate confidence interval for probability estimate."""
-        margin = 0.1  # Simplified margin of error
-        return (max(0, probability - margin), min(1, probability + margin))
+        if p.ndim == 0:
+            return (float(lower), float(upper))
+        return lower, upper
         
     def _analyze_network_signatures(self, video_path: str) -> Dict:
         """Analyze network protocol signatures in metadata."""
@@ -427,30 +642,93 @@ class AlternativeHypothesisTester:
         
     def _analyze_video_comprehensive(self, video_path: str) -> VideoAnalysisResult:
         """Perform comprehensive video analysis."""
-        # Placeholder implementation
-        return VideoAnalysisResult(
-            filename=video_path,
-            metadata={},
-            compression_ratios=[],
-            frame_discontinuities=[],
-            adobe_signatures=[],
-            timestamp_anomalies=[]
-        )
+        return analyze_video(video_path)
+        
+    def _analyze_videos_parallel(self, video_paths: List[str], workers: int = 1) -> List[VideoAnalysisResult]:
+        """
+        Analyze several videos, spreading them across worker threads.
+        
+        The work is mostly waiting on ffprobe subprocesses, so threads
+        overlap it without process startup or pickling, and share the
+        in-process analysis cache. Opt-in: the default of 1 analyzes inline.
+        
+        Args:
+            video_paths: Paths to analyze
+            workers: Maximum worker threads; -1 uses one per CPU
+            
+        Returns:
+            Analyses in the same order as video_paths
+        """
+        max_workers = (os.cpu_count() or 1) if workers == -1 else max(1, workers)
+        max_workers = min(max_workers, len(video_paths))
+        
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(analyze_video, video_paths))
+        return [analyze_video(path) for path in video_paths]
         
     def _perform_statistical_comparison(self, target: VideoAnalysisResult, 
                                       baselines: List[VideoAnalysisResult]) -> Dict:
-        """Perform statistical comparison with baseline videos."""
-        return {
+        """
+        Perform statistical comparison with baseline videos.
+        
+        Baseline compression ratios are stacked into a NaN-padded matrix so the
+        t-tests and effect sizes for every baseline come from one vectorized
+        call instead of a Python loop over baselines.
+        """
+        comparison = {
             'statistical_tests': [],
             'significance_levels': [],
             'anomaly_scores': []
         }
         
+        # Ratios are stored as float32; the tests run in float64
+        target_ratios = target.compression_ratios.astype(np.float64)
+        baselines = [b for b in baselines if b.compression_ratios.size > 1]
+        if target_ratios.size < 2 or not baselines:
+            return comparison
+            
+        # Stack baselines into a (n_baselines, max_length) matrix padded with NaN
+        lengths = np.array([b.compression_ratios.size for b in baselines])
+        baseline_matrix = np.full((len(baselines), lengths.max()), np.nan)
+        for row, baseline in enumerate(baselines):
+            baseline_matrix[row, :lengths[row]] = baseline.compression_ratios
+            
+        # Welch's t-test of the target against every baseline at once
+        t_stats, t_p_values = stats.ttest_ind(
+            target_ratios[None, :], baseline_matrix,
+            axis=1, equal_var=False, nan_policy='omit'
+        )
+        
+        # Standardized mean difference relative to each baseline
+        baseline_means = np.nanmean(baseline_matrix, axis=1)
+        baseline_stds = np.nanstd(baseline_matrix, axis=1, ddof=1)
+        effect_sizes = (target_ratios.mean() - baseline_means) / np.where(baseline_stds > 0, baseline_stds, np.nan)
+        
+        # Two-sample KS has no axis support; run it per baseline row
+        for row, baseline in enumerate(baselines):
+            ks_stat, ks_p_value = stats.ks_2samp(target_ratios, baseline_matrix[row, :lengths[row]])
+            comparison['statistical_tests'].append({
+                'baseline': baseline.filename,
+                't_statistic': float(t_stats[row]),
+                't_p_value': float(t_p_values[row]),
+                'ks_statistic': float(ks_stat),
+                'ks_p_value': float(ks_p_value),
+                'significant': bool(min(t_p_values[row], ks_p_value) < self.significance_level)
+            })
+            
+        comparison['significance_levels'] = [float(p) for p in t_p_values]
+        comparison['anomaly_scores'] = [float(e) for e in effect_sizes]
+        
+        return comparison
+        
     def _generate_overall_assessment(self, hypothesis_tests: List[HypothesisTest], 
                                    baseline_comparison: Dict = None) -> Dict:
         """Generate overall assessment of alternative hypotheses."""
-        total_alternative_probability = sum(test.probability for test in hypothesis_tests)
-        editing_probability = max(0, 1 - total_alternative_probability)
+        probabilities = np.fromiter((test.probability for test in hypothesis_tests),
+                                    dtype=np.float64, count=len(hypothesis_tests))
+        total_alternative_probability = float(probabilities.sum())
+        editing_probability = float(np.clip(1.0 - total_alternative_probability, 0.0, 1.0))
         
         # Determine conclusion confidence
         if total_alternative_probability > 0.5:
@@ -482,9 +760,16 @@ class AlternativeHypothesisTester:
             
     def _save_results(self, results: Dict):
         """Save analysis results to file."""
-        output_file = os.path.join(self.output_dir, 'alternative_hypothesis_results.json')
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        output_file = self.output_dir / 'alternative_hypothesis_results.json'
+        if orjson is not None:
+            payload = orjson.dumps(
+                results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            payload = json.dumps(results, indent=2, cls=_NumpyJSONEncoder).encode('utf-8')
+        with open(output_file, 'wb') as f:
+            f.write(payload)
         self.logger.info(f"Results saved to {output_file}")
 
 def main():
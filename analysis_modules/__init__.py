@@ -6,14 +6,20 @@ Comprehensive computer vision analysis modules for forensic video analysis.
 """
 
 from .compression_analyzer import CompressionAnalyzer
-from .optical_flow_analyzer import OpticalFlowAnalyzer
+from .optical_flow_analyzer import FlowResult, OpticalFlowAnalyzer
 from .histogram_analyzer import HistogramAnalyzer
 from .noise_analyzer import NoiseAnalyzer
+from .frame_context import FrameContext, make_context
+from .pipeline import AnalysisPipeline
 
 __all__ = [
     'CompressionAnalyzer',
     'OpticalFlowAnalyzer', 
+    'FlowResult',
     'HistogramAnalyzer',
-    'NoiseAnalyzer'
+    'NoiseAnalyzer',
+    'FrameContext',
+    'make_context',
+    'AnalysisPipeline'
 ]
 
@@ -0,0 +1,382 @@
+"""
+Compiled Kernels
+===============
+
+Numba-compiled numeric kernels shared by the analysis modules. These cover
+small per-frame reductions where NumPy's per-call dispatch and temporaries
+dominate the arithmetic.
+
+The kernels are loaded from the ahead-of-time build (see _kernels_aot) when
+it is present, and JIT-compiled with Numba otherwise.
+
+The kernels are serial (no prange). They release the GIL, and the analysis
+pipeline already runs frames on one thread per core, so parallel kernels
+would only oversubscribe the cores. test_kernels checks each kernel against
+the NumPy/OpenCV/scikit-image computation it replaces.
+"""
+
+import math
+
+import numpy as np
+
+def _dct8_basis() -> np.ndarray:
+    """Orthonormal 8-point DCT-II matrix A, with A @ block @ A.T == cv2.dct(block)."""
+    k = np.arange(8)[:, None]
+    n = np.arange(8)[None, :]
+    basis = np.sqrt(2.0 / 8) * np.cos(np.pi * (2 * n + 1) * k / 16)
+    basis[0, :] = np.sqrt(1.0 / 8)
+    return basis.astype(np.float32)
+
+# Shared 8x8 DCT basis and its contiguous transpose for block-level code
+DCT8 = _dct8_basis()
+DCT8_T = np.ascontiguousarray(DCT8.T)
+
+def _entropy_u8(hist):
+    """
+    Shannon entropy (bits) of a normalized histogram.
+
+    Args:
+        hist: 1-D histogram already normalized to sum to 1
+
+    Returns:
+        Entropy in bits; bins at or below 1e-10 contribute nothing
+    """
+    s = 0.0
+    for i in range(hist.size):
+        p = hist[i]
+        if p > 1e-10:
+            s -= p * math.log2(p)
+    return s
+
+def _block_stats(gray, basis):
+    """
+    DC/AC statistics of the 8x8 block DCT of a grayscale frame.
+
+    Each 8-row strip is transformed along its columns in one vectorizable
+    pass, then every block in the strip along its rows. Per-block values are
+    folded into Welford accumulators, so no per-block arrays are stored.
+
+    Args:
+        gray: 2-D grayscale frame; trailing partial blocks are ignored
+        basis: 8x8 orthonormal DCT-II matrix (float32)
+
+    Returns:
+        (dc_variance, ac_energy_mean, ac_energy_std), population statistics;
+        NaN when the frame holds no complete block
+    """
+    n_rows = gray.shape[0] // 8
+    n_cols = gray.shape[1] // 8
+    width = n_cols * 8
+    strip = np.empty((8, width), dtype=np.float32)
+
+    count = 0
+    dc_mean = 0.0
+    dc_m2 = 0.0
+    ac_mean = 0.0
+    ac_m2 = 0.0
+
+    for block_row in range(n_rows):
+        top = block_row * 8
+
+        # Column transform of the whole strip: strip = basis @ gray[top:top+8]
+        for i in range(8):
+            for x in range(width):
+                strip[i, x] = 0.0
+            for k in range(8):
+                weight = basis[i, k]
+                for x in range(width):
+                    strip[i, x] += weight * gray[top + k, x]
+
+        # Row transform per block: coefficients = strip_block @ basis.T
+        for block_col in range(n_cols):
+            left = block_col * 8
+            dc = np.float32(0.0)
+            ac_energy = np.float32(0.0)
+            for i in range(8):
+                for j in range(8):
+                    coefficient = np.float32(0.0)
+                    for k in range(8):
+                        coefficient += strip[i, left + k] * basis[j, k]
+                    if i == 0 and j == 0:
+                        dc = coefficient
+                    else:
+                        ac_energy += coefficient * coefficient
+
+            count += 1
+            delta = dc - dc_mean
+            dc_mean += delta / count
+            dc_m2 += delta * (dc - dc_mean)
+            delta = ac_energy - ac_mean
+            ac_mean += delta / count
+            ac_m2 += delta * (ac_energy - ac_mean)
+
+    if count == 0:
+        return np.nan, np.nan, np.nan
+    return dc_m2 / count, ac_mean, math.sqrt(ac_m2 / count)
+
+def _masked_sobel_stats(gray, mask):
+    """
+    Statistics of the 3x3 Sobel gradient magnitude over masked pixels.
+
+    The gradient is evaluated only where the mask is set, with the same
+    reflect-101 border handling as cv2.Sobel, so no gradient planes are
+    materialized.
+
+    Args:
+        gray: 2-D uint8 frame
+        mask: 2-D uint8 mask of the same shape; nonzero pixels are included
+
+    Returns:
+        (count, mean, std) of the magnitude, population std; mean and std
+        are NaN when no pixel is masked
+    """
+    h, w = gray.shape
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+
+    for i in range(h):
+        up = i - 1 if i > 0 else min(1, h - 1)
+        down = i + 1 if i < h - 1 else max(h - 2, 0)
+        for j in range(w):
+            if mask[i, j] == 0:
+                continue
+            left = j - 1 if j > 0 else min(1, w - 1)
+            right = j + 1 if j < w - 1 else max(w - 2, 0)
+
+            top_left = np.int32(gray[up, left])
+            top = np.int32(gray[up, j])
+            top_right = np.int32(gray[up, right])
+            mid_left = np.int32(gray[i, left])
+            mid_right = np.int32(gray[i, right])
+            bottom_left = np.int32(gray[down, left])
+            bottom = np.int32(gray[down, j])
+            bottom_right = np.int32(gray[down, right])
+
+            gx = (top_right + 2 * mid_right + bottom_right) - (top_left + 2 * mid_left + bottom_left)
+            gy = (bottom_left + 2 * bottom + bottom_right) - (top_left + 2 * top + top_right)
+            magnitude = math.sqrt(float(gx * gx + gy * gy))
+
+            count += 1
+            delta = magnitude - mean
+            mean += delta / count
+            m2 += delta * (magnitude - mean)
+
+    if count == 0:
+        return 0, np.nan, np.nan
+    return count, mean, math.sqrt(m2 / count)
+
+def _glcm4(image, levels):
+    """
+    Symmetric gray-level co-occurrence counts at distance 1 for the angles
+    0, 45, 90 and 135 degrees.
+
+    Args:
+        image: 2-D uint8 image already quantized to [0, levels)
+        levels: Number of gray levels
+
+    Returns:
+        int64 array of shape (4, levels, levels); each pair is counted in
+        both orders, matching graycomatrix(..., symmetric=True)
+    """
+    h, w = image.shape
+    counts = np.zeros((4, levels, levels), dtype=np.int64)
+
+    for i in range(h):
+        for j in range(w):
+            a = image[i, j]
+            if j + 1 < w:
+                b = image[i, j + 1]
+                counts[0, a, b] += 1
+                counts[0, b, a] += 1
+            # graycomatrix angles step rows downward (row offset
+            # round(sin(angle))), so 45 degrees pairs the up-left neighbour
+            # and 135 degrees the up-right one
+            if i > 0:
+                if j > 0:
+                    b = image[i - 1, j - 1]
+                    counts[1, a, b] += 1
+                    counts[1, b, a] += 1
+                b = image[i - 1, j]
+                counts[2, a, b] += 1
+                counts[2, b, a] += 1
+                if j + 1 < w:
+                    b = image[i - 1, j + 1]
+                    counts[3, a, b] += 1
+                    counts[3, b, a] += 1
+
+    return counts
+
+# 3x3 LBP neighbours, clockwise from the top-left; bit k of a code is set
+# when neighbour k is at least the center value
+LBP8_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1))
+
+def _lbp8_uniform_bins() -> np.ndarray:
+    """Uniform bin of each 8-bit LBP code: its set-bit count when it has at most two circular 0/1 transitions, else 9."""
+    bits = (np.arange(256)[:, None] >> np.arange(8)) & 1
+    transitions = np.sum(bits != np.roll(bits, 1, axis=1), axis=1)
+    return np.where(transitions <= 2, bits.sum(axis=1), 9).astype(np.uint8)
+
+LBP8_UNIFORM_BIN = _lbp8_uniform_bins()
+
+def _lbp_uniform_hist(image):
+    """
+    Histogram of rotation-invariant uniform local binary patterns.
+
+    Uses the 8-neighbour, radius-1 square neighbourhood with integer
+    comparisons, so each pixel's code fits in a byte and its uniform bin is
+    a LBP8_UNIFORM_BIN lookup. Border pixels, which lack a full
+    neighbourhood, are not counted.
+
+    Args:
+        image: 2-D uint8 image
+
+    Returns:
+        int64 counts of the 10 codes (0-8 set bits for uniform patterns, 9
+        for all non-uniform ones)
+    """
+    h, w = image.shape
+    counts = np.zeros(10, dtype=np.int64)
+
+    for r in range(1, h - 1):
+        for c in range(1, w - 1):
+            center = image[r, c]
+            code = 0
+            for k in range(8):
+                if image[r + LBP8_OFFSETS[k][0], c + LBP8_OFFSETS[k][1]] >= center:
+                    code |= 1 << k
+            counts[LBP8_UNIFORM_BIN[code]] += 1
+
+    return counts
+
+# Response range of the 3x3 high-pass kernel (8 * center - 8 neighbours) on uint8
+HIGHPASS_MAX = 8 * 255
+
+def _highpass_hist(gray):
+    """
+    Value histogram of the 3x3 high-pass response of a grayscale frame.
+
+    The response 8 * center - sum(8 neighbours) is integer-valued, so it is
+    counted exactly per value instead of being materialized. Borders follow
+    the reflect-101 rule of cv2.filter2D.
+
+    Args:
+        gray: 2-D uint8 frame
+
+    Returns:
+        int64 counts of length 2 * HIGHPASS_MAX + 1; index k counts the
+        response k - HIGHPASS_MAX
+    """
+    h, w = gray.shape
+    counts = np.zeros(2 * HIGHPASS_MAX + 1, dtype=np.int64)
+
+    for i in range(h):
+        up = i - 1 if i > 0 else min(1, h - 1)
+        down = i + 1 if i < h - 1 else max(h - 2, 0)
+        for j in range(w):
+            left = j - 1 if j > 0 else min(1, w - 1)
+            right = j + 1 if j < w - 1 else max(w - 2, 0)
+
+            neighbours = (
+                np.int32(gray[up, left]) + np.int32(gray[up, j]) + np.int32(gray[up, right])
+                + np.int32(gray[i, left]) + np.int32(gray[i, right])
+                + np.int32(gray[down, left]) + np.int32(gray[down, j]) + np.int32(gray[down, right])
+            )
+            counts[8 * np.int32(gray[i, j]) - neighbours + HIGHPASS_MAX] += 1
+
+    return counts
+
+def _flow_stats(flow, scale, threshold):
+    """
+    Statistics of a dense flow field over its significant-motion pixels.
+
+    One sweep computes the magnitude of each vector, keeps those above the
+    threshold, and accumulates their magnitude mean/std and mean unit
+    direction, without materializing magnitude, angle or mask planes.
+
+    Args:
+        flow: H x W x 2 float32 flow field (x, y components)
+        scale: Factor applied to magnitudes before thresholding (e.g. to
+            convert downscaled-frame pixels to full-resolution pixels)
+        threshold: Scaled magnitude a vector must exceed to be counted
+
+    Returns:
+        (count, mean, std, mean_cos, mean_sin) over the counted vectors,
+        population std; all but count are NaN when no vector is counted
+    """
+    h, w = flow.shape[0], flow.shape[1]
+    count = 0
+    total = 0.0
+    total_sq = 0.0
+    sum_cos = 0.0
+    sum_sin = 0.0
+
+    for i in range(h):
+        for j in range(w):
+            fx = np.float64(flow[i, j, 0])
+            fy = np.float64(flow[i, j, 1])
+            length = math.sqrt(fx * fx + fy * fy)
+            magnitude = length * scale
+            if magnitude <= threshold:
+                continue
+
+            # Plain double sums: magnitudes are small and positive, so the
+            # sum-of-squares variance stays accurate and the loop avoids a
+            # division per pixel
+            count += 1
+            total += magnitude
+            total_sq += magnitude * magnitude
+            inv_length = 1.0 / length
+            sum_cos += fx * inv_length
+            sum_sin += fy * inv_length
+
+    if count == 0:
+        return 0, np.nan, np.nan, np.nan, np.nan
+    mean = total / count
+    return count, mean, math.sqrt(max(total_sq / count - mean * mean, 0.0)), sum_cos / count, sum_sin / count
+
+def _direction_consistency(angles):
+    """
+    Resultant length of unit vectors at the given angles.
+
+    Args:
+        angles: 1-D array of angles in radians (non-empty)
+
+    Returns:
+        Length of the mean direction vector, 1 for identical angles and
+        near 0 for uniformly spread ones
+    """
+    sum_cos = 0.0
+    sum_sin = 0.0
+    for angle in angles:
+        sum_cos += math.cos(angle)
+        sum_sin += math.sin(angle)
+    return math.sqrt(sum_cos * sum_cos + sum_sin * sum_sin) / angles.size
+
+try:
+    # Ahead-of-time build; skips importing Numba and JIT compilation
+    from .forensic_kernels import (
+        block_stats, direction_consistency, entropy_u8, flow_stats, glcm4, highpass_hist, lbp_uniform_hist, masked_sobel_stats
+    )
+except ImportError:
+    from numba import njit
+
+    # nogil lets kernels overlap when analyzers run on several threads
+    entropy_u8 = njit(cache=True, nogil=True, fastmath=True)(_entropy_u8)
+    block_stats = njit(cache=True, nogil=True, fastmath=True)(_block_stats)
+    masked_sobel_stats = njit(cache=True, nogil=True, fastmath=True)(_masked_sobel_stats)
+    glcm4 = njit(cache=True, nogil=True)(_glcm4)
+    lbp_uniform_hist = njit(cache=True, nogil=True)(_lbp_uniform_hist)
+    highpass_hist = njit(cache=True, nogil=True)(_highpass_hist)
+    flow_stats = njit(cache=True, nogil=True, fastmath=True)(_flow_stats)
+    direction_consistency = njit(cache=True, nogil=True, fastmath=True)(_direction_consistency)
+
+    # Compile (or load from cache) at import so the first frame is not charged
+    entropy_u8(np.zeros(256, dtype=np.float32))
+    block_stats(np.zeros((8, 8), dtype=np.uint8), np.eye(8, dtype=np.float32))
+    masked_sobel_stats(np.zeros((3, 3), dtype=np.uint8), np.ones((3, 3), dtype=np.uint8))
+    glcm4(np.zeros((2, 2), dtype=np.uint8), 8)
+    lbp_uniform_hist(np.zeros((3, 3), dtype=np.uint8))
+    highpass_hist(np.zeros((2, 2), dtype=np.uint8))
+    flow_stats(np.zeros((2, 2, 2), dtype=np.float32), 1.0, 0.5)
+    direction_consistency(np.zeros(1, dtype=np.float32))
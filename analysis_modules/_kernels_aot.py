@@ -0,0 +1,61 @@
+"""
+Ahead-of-Time Kernel Build
+=========================
+
+Compiles the kernels in _kernels into a native extension module,
+``forensic_kernels``, next to this file. When that module is present,
+_kernels imports it instead of JIT-compiling, so a cold start (no Numba
+cache yet) does not pay seconds of compilation before the first frame.
+
+Build with:
+
+    python -m analysis_modules._kernels_aot
+
+The exported signatures are the only argument types the compiled module
+accepts: float32 1-D histograms or angle arrays, uint8 2-D frames (alone or
+with a float32 8x8 basis), uint8 2-D frame/mask pairs, uint8 2-D quantized
+images with an int64 level count, and float32 H x W x 2 flow fields with
+float64 scalars. Rebuild after changing _kernels.
+
+Numba's AOT compiler does not take fastmath, so the compiled block_stats runs
+somewhat slower per frame than the JIT version; prefer the JIT with its
+on-disk cache for long videos and the AOT build for one-off short runs.
+"""
+
+import os
+
+from numba.pycc import CC
+
+from . import _kernels
+
+def build(output_dir: str = os.path.dirname(os.path.abspath(__file__))) -> str:
+    """
+    Compile the kernels into the forensic_kernels extension module.
+
+    Args:
+        output_dir: Directory receiving the compiled module
+
+    Returns:
+        Path of the compiled module
+    """
+    cc = CC('forensic_kernels')
+    cc.output_dir = output_dir
+    cc.verbose = False
+    # Built per machine (the extension is not committed), so target the host
+    # CPU's vector extensions like the JIT does
+    cc.target_cpu = 'host'
+
+    cc.export('entropy_u8', 'f8(f4[:])')(_kernels._entropy_u8)
+    cc.export('block_stats', 'UniTuple(f8, 3)(u1[:, :], f4[:, :])')(_kernels._block_stats)
+    cc.export('glcm4', 'i8[:, :, :](u1[:, :], i8)')(_kernels._glcm4)
+    cc.export('highpass_hist', 'i8[:](u1[:, :])')(_kernels._highpass_hist)
+    cc.export('lbp_uniform_hist', 'i8[:](u1[:, :])')(_kernels._lbp_uniform_hist)
+    cc.export('masked_sobel_stats', 'Tuple((i8, f8, f8))(u1[:, :], u1[:, :])')(_kernels._masked_sobel_stats)
+    cc.export('direction_consistency', 'f8(f4[:])')(_kernels._direction_consistency)
+    cc.export('flow_stats', 'Tuple((i8, f8, f8, f8, f8))(f4[:, :, :], f8, f8)')(_kernels._flow_stats)
+
+    cc.compile()
+    return os.path.join(output_dir, cc.output_file)
+
+if __name__ == '__main__':
+    print(f"Built {build()}")
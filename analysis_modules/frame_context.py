@@ -0,0 +1,90 @@
+"""
+Frame Context Module
+===================
+
+Per-frame cache of color-space conversions shared between analysis modules,
+so each conversion runs at most once per frame.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Tuple, Union
+
+import numpy as np
+import cv2
+
+# Scale of the reduced-resolution frame used by aggregate statistics
+SMALL_SCALE = 0.5
+
+@dataclass
+class FrameContext:
+    """
+    RGB frame plus lazily computed color-space conversions.
+
+    Each conversion is computed on first access and reused by every analyzer
+    that receives the same context. The ``*_small`` variants are built from a
+    single area-downsampled copy of the frame, for aggregate metrics that do
+    not need full resolution.
+    """
+    rgb: np.ndarray
+
+    @cached_property
+    def bgr(self) -> np.ndarray:
+        return cv2.cvtColor(self.rgb, cv2.COLOR_RGB2BGR)
+
+    @cached_property
+    def gray(self) -> np.ndarray:
+        return cv2.cvtColor(self.rgb, cv2.COLOR_RGB2GRAY)
+
+    @cached_property
+    def hsv(self) -> np.ndarray:
+        return cv2.cvtColor(self.rgb, cv2.COLOR_RGB2HSV)
+
+    @cached_property
+    def lab(self) -> np.ndarray:
+        return cv2.cvtColor(self.rgb, cv2.COLOR_RGB2LAB)
+
+    @cached_property
+    def rgb_small(self) -> np.ndarray:
+        return cv2.resize(self.rgb, None, fx=SMALL_SCALE, fy=SMALL_SCALE, interpolation=cv2.INTER_AREA)
+
+    @cached_property
+    def bgr_small(self) -> np.ndarray:
+        return cv2.cvtColor(self.rgb_small, cv2.COLOR_RGB2BGR)
+
+    @cached_property
+    def gray_small(self) -> np.ndarray:
+        return cv2.cvtColor(self.rgb_small, cv2.COLOR_RGB2GRAY)
+
+    @cached_property
+    def hsv_small(self) -> np.ndarray:
+        return cv2.cvtColor(self.rgb_small, cv2.COLOR_RGB2HSV)
+
+    @cached_property
+    def lab_small(self) -> np.ndarray:
+        return cv2.cvtColor(self.rgb_small, cv2.COLOR_RGB2LAB)
+
+    @cached_property
+    def gray_small_mean_std(self) -> Tuple[float, float]:
+        # One meanStdDev pass shared by brightness and contrast consumers
+        mean, std = cv2.meanStdDev(self.gray_small)
+        return mean[0, 0], std[0, 0]
+
+    @cached_property
+    def gray_small_umat(self) -> cv2.UMat:
+        # Uploaded once per frame; OpenCV filters on it run on the OpenCL device
+        return cv2.UMat(self.gray_small)
+
+def make_context(frame: Union[np.ndarray, FrameContext]) -> FrameContext:
+    """
+    Wrap an RGB frame in a FrameContext.
+
+    Args:
+        frame: RGB frame data as numpy array, or an existing FrameContext
+
+    Returns:
+        The given context unchanged, or a new context for the frame
+    """
+    if isinstance(frame, FrameContext):
+        return frame
+    return FrameContext(frame)
@@ -6,94 +6,138 @@ Detects color and lighting discontinuities that may indicate video splicing
 through comprehensive histogram analysis and color distribution examination.
 """
 
+from collections import deque
 import numpy as np
 import cv2
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 import logging
 from scipy import stats
 
+from ._kernels import entropy_u8
+from .frame_context import FrameContext, make_context
+
 logger = logging.getLogger(__name__)
 
+def _unit(histogram: np.ndarray) -> np.ndarray:
+    """Mean-center and L2-normalize a histogram; constant input yields NaNs."""
+    centered = histogram - histogram.mean()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return centered / np.linalg.norm(centered)
+
 class HistogramAnalyzer:
     """Analyzes color histograms to detect lighting and camera changes."""
     
+    # Histograms compared against the baseline for correlation
+    CORRELATION_CHANNELS = ('r_hist', 'g_hist', 'b_hist', 'h_hist', 's_hist', 'v_hist')
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.baseline_histograms = None
-        self.histogram_history = []
+        self._baseline_unit = {}
         self.max_history = 10
+        self.histogram_history = deque(maxlen=self.max_history)
         
         # Histogram parameters
         self.hist_bins = 64  # Reduced bins for better stability
         self.hist_range = [0, 256]
     
-    def analyze_frame(self, frame: np.ndarray, timestamp: float) -> Optional[Dict[str, Any]]:
+    def analyze_frame(self, frame: Union[np.ndarray, FrameContext], timestamp: float) -> Optional[Dict[str, Any]]:
         """
         Analyze color histogram characteristics of a frame.
         
         Args:
-            frame: RGB frame data as numpy array
+            frame: RGB frame data as numpy array, or a FrameContext shared
+                with other analyzers
             timestamp: Frame timestamp in seconds
             
         Returns:
             Dictionary containing histogram analysis results
         """
         try:
-            # Calculate comprehensive histogram metrics
-            hist_metrics = self._calculate_histogram_metrics(frame)
-            
-            # Detect color shifts and lighting changes
-            color_analysis = self._analyze_color_changes(hist_metrics)
-            
-            # Calculate anomaly score
-            anomaly_score = self._calculate_histogram_anomaly_score(hist_metrics, color_analysis)
-            
-            # Update history
-            self._update_histogram_history(hist_metrics, timestamp)
-            
-            result = {
-                'confidence': min(1.0, anomaly_score / 2.5),
-                'evidence_type': 'color_shift' if color_analysis['significant_shift'] else 'normal',
-                'anomaly_score': anomaly_score,
-                'details': {
-                    'brightness_mean': hist_metrics['brightness_mean'],
-                    'contrast_std': hist_metrics['contrast_std'],
-                    'color_temperature': hist_metrics['color_temperature'],
-                    'saturation_mean': hist_metrics['saturation_mean'],
-                    'histogram_correlation': color_analysis.get('histogram_correlation', 1.0),
-                    'brightness_change_percent': color_analysis.get('brightness_change_percent', 0),
-                    'color_shift': color_analysis['significant_shift'],
-                    'dominant_color_change': color_analysis.get('dominant_color_change', False),
-                    'lighting_change_score': color_analysis.get('lighting_change_score', 0)
-                }
-            }
-            
-            return result
+            return self.score_frame(self.measure_frame(frame), timestamp)
             
         except Exception as e:
             logger.error(f"Histogram analysis failed at {timestamp:.1f}s: {e}")
             return None
     
-    def _calculate_histogram_metrics(self, frame: np.ndarray) -> Dict[str, float]:
-        """Calculate comprehensive histogram and color metrics."""
-        # Convert to different color spaces for analysis
-        frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-        frame_hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
-        frame_lab = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2LAB)
-        frame_gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+    def measure_frame(self, frame: Union[np.ndarray, FrameContext]) -> Dict[str, Any]:
+        """
+        Calculate histogram metrics for a frame without touching analyzer state.
+        
+        Safe to call concurrently; pair with score_frame, called in frame order.
+        
+        Args:
+            frame: RGB frame data as numpy array, or a FrameContext
+            
+        Returns:
+            Histogram metrics dictionary
+        """
+        return self._calculate_histogram_metrics(make_context(frame))
+    
+    def score_frame(self, hist_metrics: Dict[str, Any], timestamp: float) -> Dict[str, Any]:
+        """
+        Score measured metrics against the baseline and recent frame history.
+        
+        Args:
+            hist_metrics: Output of measure_frame
+            timestamp: Frame timestamp in seconds
+            
+        Returns:
+            Dictionary containing histogram analysis results
+        """
+        # Detect color shifts and lighting changes
+        color_analysis = self._analyze_color_changes(hist_metrics)
+        
+        # Calculate anomaly score
+        anomaly_score = self._calculate_histogram_anomaly_score(hist_metrics, color_analysis)
         
-        # 1. Basic brightness and contrast
-        brightness_mean = np.mean(frame_gray)
-        contrast_std = np.std(frame_gray)
+        # Update history
+        self._update_histogram_history(hist_metrics, timestamp)
+        
+        return {
+            'confidence': min(1.0, anomaly_score / 2.5),
+            'evidence_type': 'color_shift' if color_analysis['significant_shift'] else 'normal',
+            'anomaly_score': anomaly_score,
+            'details': {
+                'brightness_mean': hist_metrics['brightness_mean'],
+                'contrast_std': hist_metrics['contrast_std'],
+                'color_temperature': hist_metrics['color_temperature'],
+                'saturation_mean': hist_metrics['saturation_mean'],
+                'histogram_correlation': color_analysis.get('histogram_correlation', 1.0),
+                'brightness_change_percent': color_analysis.get('brightness_change_percent', 0),
+                'color_shift': color_analysis['significant_shift'],
+                'dominant_color_change': color_analysis.get('dominant_color_change', False),
+                'lighting_change_score': color_analysis.get('lighting_change_score', 0)
+            }
+        }
+    
+    def _calculate_histogram_metrics(self, ctx: FrameContext) -> Dict[str, float]:
+        """Calculate comprehensive histogram and color metrics."""
+        # Color space conversions are shared through the frame context;
+        # distribution statistics use the downsampled frame
+        frame_bgr = ctx.bgr_small
+        frame_hsv = ctx.hsv_small
+        frame_lab = ctx.lab_small
+        frame_gray = ctx.gray
+        
+        # 1. Basic brightness and contrast (full resolution), one pass
+        mean_gray, std_gray = cv2.meanStdDev(frame_gray)
+        brightness_mean = mean_gray[0, 0]
+        contrast_std = std_gray[0, 0]
+        
+        # Per-channel mean and spread in one pass, shared by color temperature,
+        # saturation and color distribution
+        mean_bgr, std_bgr = cv2.meanStdDev(frame_bgr)
+        mean_hsv, std_hsv = cv2.meanStdDev(frame_hsv)
         
         # 2. Color temperature estimation
-        color_temperature = self._estimate_color_temperature(frame_bgr)
+        color_temperature = self._estimate_color_temperature(mean_bgr.ravel())
         
         # 3. Saturation analysis
-        saturation_mean = np.mean(frame_hsv[:, :, 1])
+        saturation_mean = mean_hsv[1, 0]
         
         # 4. RGB histograms
-        rgb_histograms = self._calculate_rgb_histograms(frame)
+        rgb_histograms = self._calculate_rgb_histograms(ctx.rgb_small)
         
         # 5. HSV histograms
         hsv_histograms = self._calculate_hsv_histograms(frame_hsv)
@@ -105,7 +149,7 @@ class HistogramAnalyzer:
         dominant_colors = self._extract_dominant_colors(frame_bgr)
         
         # 8. Color distribution metrics
-        color_distribution = self._analyze_color_distribution(frame_bgr)
+        color_distribution = self._analyze_color_distribution(std_bgr.ravel() ** 2, std_hsv[0, 0])
         
         return {
             'brightness_mean': brightness_mean,
@@ -124,8 +168,7 @@ class HistogramAnalyzer:
         histograms = {}
         
         for i, channel in enumerate(['r', 'g', 'b']):
-            hist = cv2.calcHist([frame], [i], None, [self.hist_bins], self.hist_range)
-            hist = hist.flatten() / hist.sum()  # Normalize
+            hist = self._channel_histogram(frame, i, self.hist_bins, self.hist_range)
             histograms[f'{channel}_hist'] = hist
             histograms[f'{channel}_hist_mean'] = np.mean(hist)
             histograms[f'{channel}_hist_std'] = np.std(hist)
@@ -137,16 +180,13 @@ class HistogramAnalyzer:
         histograms = {}
         
         # Hue histogram (circular)
-        h_hist = cv2.calcHist([frame_hsv], [0], None, [180], [0, 180])
-        h_hist = h_hist.flatten() / h_hist.sum()
+        h_hist = self._channel_histogram(frame_hsv, 0, 180, [0, 180])
         
         # Saturation histogram
-        s_hist = cv2.calcHist([frame_hsv], [1], None, [self.hist_bins], self.hist_range)
-        s_hist = s_hist.flatten() / s_hist.sum()
+        s_hist = self._channel_histogram(frame_hsv, 1, self.hist_bins, self.hist_range)
         
         # Value histogram
-        v_hist = cv2.calcHist([frame_hsv], [2], None, [self.hist_bins], self.hist_range)
-        v_hist = v_hist.flatten() / v_hist.sum()
+        v_hist = self._channel_histogram(frame_hsv, 2, self.hist_bins, self.hist_range)
         
         histograms.update({
             'h_hist': h_hist,
@@ -164,27 +204,31 @@ class HistogramAnalyzer:
         histograms = {}
         
         for i, channel in enumerate(['l', 'a', 'b']):
-            hist = cv2.calcHist([frame_lab], [i], None, [self.hist_bins], self.hist_range)
-            hist = hist.flatten() / hist.sum()
+            hist = self._channel_histogram(frame_lab, i, self.hist_bins, self.hist_range)
             histograms[f'{channel}_lab_hist'] = hist
             histograms[f'{channel}_lab_entropy'] = self._calculate_histogram_entropy(hist)
         
         return histograms
     
+    def _channel_histogram(self, image: np.ndarray, channel: int, bins: int, value_range: List[int]) -> np.ndarray:
+        """
+        Normalized histogram of one channel of an 8-bit image.
+        
+        cv2.calcHist on the interleaved image is kept here: it measured faster
+        than np.bincount and than a single 3D calcHist marginalized per channel.
+        """
+        hist = cv2.calcHist([image], [channel], None, [bins], value_range).ravel()
+        hist /= hist.sum()
+        return hist
+    
     def _calculate_histogram_entropy(self, histogram: np.ndarray) -> float:
         """Calculate entropy of a histogram."""
-        # Add small epsilon to avoid log(0)
-        histogram = histogram + 1e-10
-        entropy = -np.sum(histogram * np.log2(histogram))
-        return entropy
+        return entropy_u8(histogram)
     
-    def _estimate_color_temperature(self, frame_bgr: np.ndarray) -> float:
-        """Estimate color temperature using RGB ratios."""
+    def _estimate_color_temperature(self, mean_bgr: np.ndarray) -> float:
+        """Estimate color temperature from per-channel BGR means."""
         try:
-            # Calculate mean RGB values
-            b_mean = np.mean(frame_bgr[:, :, 0])
-            g_mean = np.mean(frame_bgr[:, :, 1])
-            r_mean = np.mean(frame_bgr[:, :, 2])
+            b_mean, g_mean, r_mean = mean_bgr
             
             # Avoid division by zero
             if b_mean == 0:
@@ -206,57 +250,49 @@ class HistogramAnalyzer:
             return 5500  # Default daylight temperature
     
     def _extract_dominant_colors(self, frame_bgr: np.ndarray, k: int = 5) -> Dict[str, Any]:
-        """Extract dominant colors using K-means clustering."""
+        """Extract dominant colors from a fixed 512-color palette histogram."""
         try:
-            # Reshape frame for clustering
-            data = frame_bgr.reshape((-1, 3))
-            data = np.float32(data)
-            
-            # Apply K-means
-            criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 20, 1.0)
-            _, labels, centers = cv2.kmeans(data, k, None, criteria, 10, cv2.KMEANS_RANDOM_CENTERS)
+            # Quantize each channel to 3 bits, giving an 8x8x8 palette
+            quantized = frame_bgr >> 5
+            codes = ((quantized[:, :, 0].astype(np.uint16) << 6) |
+                     (quantized[:, :, 1].astype(np.uint16) << 3) |
+                     quantized[:, :, 2])
+            counts = np.bincount(codes.ravel(), minlength=512)
+            palette_histogram = counts.astype(np.float32)
+            palette_histogram /= codes.size
             
-            # Calculate color percentages
-            unique, counts = np.unique(labels, return_counts=True)
-            percentages = counts / len(labels)
+            # Top-k occupied palette bins, most frequent first
+            top_bins = np.argsort(counts)[::-1][:k]
+            top_bins = top_bins[counts[top_bins] > 0]
             
-            # Sort by percentage
-            sorted_indices = np.argsort(percentages)[::-1]
+            # Reconstruct BGR bin centers from palette indices
+            centers = np.stack([(top_bins >> 6) & 7, (top_bins >> 3) & 7, top_bins & 7], axis=1) * 32 + 16
             
             dominant_colors = []
-            for i in sorted_indices:
-                color = centers[i].astype(int)
-                percentage = percentages[i]
+            for color, bin_index in zip(centers, top_bins):
                 dominant_colors.append({
                     'color': color.tolist(),
-                    'percentage': float(percentage)
+                    'percentage': float(palette_histogram[bin_index])
                 })
             
             return {
                 'dominant_colors': dominant_colors,
-                'color_diversity': len(unique),
-                'primary_color_dominance': float(percentages[sorted_indices[0]])
+                'palette_histogram': palette_histogram,
+                'color_diversity': len(dominant_colors),
+                'primary_color_dominance': float(palette_histogram[top_bins[0]])
             }
             
         except Exception:
             return {
                 'dominant_colors': [],
+                'palette_histogram': np.zeros(512, dtype=np.float32),
                 'color_diversity': 0,
                 'primary_color_dominance': 0.0
             }
     
-    def _analyze_color_distribution(self, frame_bgr: np.ndarray) -> Dict[str, float]:
-        """Analyze overall color distribution characteristics."""
+    def _analyze_color_distribution(self, color_variance: np.ndarray, hue_std: float) -> Dict[str, float]:
+        """Analyze overall color distribution from per-channel BGR variance and hue spread."""
         try:
-            # Convert to different color spaces
-            frame_hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
-            
-            # Color variance
-            color_variance = np.var(frame_bgr, axis=(0, 1))
-            
-            # Hue distribution
-            hue_std = np.std(frame_hsv[:, :, 0])
-            
             # Color uniformity (inverse of variance)
             color_uniformity = 1.0 / (1.0 + np.mean(color_variance))
             
@@ -278,6 +314,10 @@ class HistogramAnalyzer:
         if self.baseline_histograms is None:
             # First frame becomes baseline
             self.baseline_histograms = hist_metrics.copy()
+            self._baseline_unit = {
+                channel: _unit(self.baseline_histograms[channel])
+                for channel in self.CORRELATION_CHANNELS
+            }
             return {'significant_shift': False}
         
         # Calculate histogram correlations
@@ -316,21 +356,12 @@ class HistogramAnalyzer:
     
     def _calculate_histogram_correlations(self, hist_metrics: Dict[str, Any]) -> Dict[str, float]:
         """Calculate correlations between current and baseline histograms."""
+        # Pearson correlation reduces to a dot product of unit-normalized
+        # histograms; the baseline side is normalized once
         correlations = []
         
-        # Compare RGB histograms
-        for channel in ['r', 'g', 'b']:
-            current_hist = hist_metrics[f'{channel}_hist']
-            baseline_hist = self.baseline_histograms[f'{channel}_hist']
-            correlation = np.corrcoef(current_hist, baseline_hist)[0, 1]
-            if not np.isnan(correlation):
-                correlations.append(correlation)
-        
-        # Compare HSV histograms
-        for channel in ['h', 's', 'v']:
-            current_hist = hist_metrics[f'{channel}_hist']
-            baseline_hist = self.baseline_histograms[f'{channel}_hist']
-            correlation = np.corrcoef(current_hist, baseline_hist)[0, 1]
+        for channel in self.CORRELATION_CHANNELS:
+            correlation = float(_unit(hist_metrics[channel]) @ self._baseline_unit[channel])
             if not np.isnan(correlation):
                 correlations.append(correlation)
         
@@ -361,21 +392,17 @@ class HistogramAnalyzer:
     def _detect_dominant_color_change(self, hist_metrics: Dict[str, Any]) -> bool:
         """Detect significant changes in dominant colors."""
         try:
-            current_colors = hist_metrics['dominant_colors']
-            baseline_colors = self.baseline_histograms['dominant_colors']
+            current_palette = hist_metrics['palette_histogram']
+            baseline_palette = self.baseline_histograms['palette_histogram']
             
-            if not current_colors or not baseline_colors:
+            if not current_palette.any() or not baseline_palette.any():
                 return False
             
-            # Compare primary dominant colors
-            current_primary = current_colors[0]['color']
-            baseline_primary = baseline_colors[0]['color']
+            # L1 distance between palette histograms (0 = identical, 2 = disjoint)
+            palette_distance = np.abs(current_palette - baseline_palette).sum()
             
-            # Calculate color distance
-            color_distance = np.sqrt(np.sum((np.array(current_primary) - np.array(baseline_primary))**2))
-            
-            # Significant change if distance > threshold
-            return color_distance > 50  # Threshold for significant color change
+            # Significant change if a quarter of the pixels moved palette bins
+            return palette_distance > 0.5
             
         except Exception:
             return False
@@ -430,8 +457,3 @@ class HistogramAnalyzer:
             'timestamp': timestamp,
             'metrics': hist_metrics
         })
-        
-        # Keep only recent history
-        if len(self.histogram_history) > self.max_history:
-            self.histogram_history.pop(0)
-
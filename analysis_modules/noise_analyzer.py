@@ -6,23 +6,128 @@ Detects encoding source changes and compression artifacts through noise pattern
 analysis, frequency domain examination, and statistical texture analysis.
 """
 
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 import numpy as np
 import cv2
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 import logging
 from scipy import ndimage, fft
 from skimage import feature, filters
 
+try:
+    import pyfftw
+except ImportError:  # optional dependency
+    pyfftw = None
+
+try:
+    import cupy
+    from cupyx.scipy import ndimage as cupy_ndimage
+except ImportError:  # optional dependency
+    cupy = None
+
+from ._kernels import HIGHPASS_MAX, glcm4, highpass_hist, lbp_uniform_hist, masked_sobel_stats
+
 logger = logging.getLogger(__name__)
 
 class NoiseAnalyzer:
     """Analyzes noise patterns to detect encoding source changes."""
     
+    # GLCM gray levels and (i - j)^2 over the level pairs, for the GLCM
+    # contrast and homogeneity weights
+    GLCM_LEVELS = 8
+    _glcm_diff_sq = np.subtract.outer(np.arange(GLCM_LEVELS), np.arange(GLCM_LEVELS)) ** 2
+    
+    # Side of the square frame the frequency signature is computed on
+    FFT_SIZE = 256
+    
+    # cv2.Laplacian's default 3x3 aperture, for the CUDA path
+    _laplacian_kernel = np.array([[0, 1, 0], [1, -4, 1], [0, 1, 0]], dtype=np.float32)
+    
+    # Structuring element widening Canny edges into ringing regions
+    _edge_dilate_kernel = np.ones((5, 5), np.uint8)
+    
+    # Per-frame record kept in the history ring buffer
+    HISTORY_FIELDS = (
+        'noise_variance', 'noise_entropy', 'frequency_signature',
+        'texture_energy', 'texture_homogeneity', 'compression_artifacts'
+    )
+    HISTORY_DTYPE = np.dtype([('timestamp', np.float64)] + [(name, np.float32) for name in HISTORY_FIELDS])
+    
+    # Metrics reused from the last full measurement while the gate is closed
+    EXPENSIVE_KEYS = (
+        'frequency_signature', 'high_freq_energy', 'texture_energy', 'texture_homogeneity',
+        'compression_artifacts', 'color_noise_variance', 'color_noise_mean',
+        'r_noise', 'g_noise', 'b_noise'
+    )
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.baseline_noise = None
-        self.noise_history = []
         self.max_history = 8
+        
+        # Fixed-size ring buffer of recent frames (struct of arrays)
+        self._history = np.zeros(self.max_history, dtype=self.HISTORY_DTYPE)
+        self._history_count = 0
+        self._history_pos = 0
+        
+        # Half-spectrum weights for the frequency signature, per frame shape
+        self._freq_weights = {}
+        
+        # Independent heavy subtasks of one frame overlap on a small pool
+        # (OpenCV, SciPy's FFT and the nogil kernels release the GIL), shut
+        # down by close(); noise_subtask_workers <= 1 runs them inline
+        self.subtask_workers = int(config.get('noise_subtask_workers', 4))
+        self._pool = None
+        if self.subtask_workers > 1:
+            self._pool = ThreadPoolExecutor(max_workers=self.subtask_workers, thread_name_prefix='noise')
+        
+        # Optional two-stage gate (off by default: a splice that keeps the
+        # noise variance but changes texture or frequency content would pass
+        # it unscored): once enough history exists and the cheap noise
+        # variance stays within noise_fast_gate_pct percent of both the
+        # baseline and the last fully measured frame, reuse the expensive
+        # metrics (FFT, GLCM/LBP, artifacts, color noise) of that frame; a full
+        # measurement is still forced every _full_every_n frames. Results of
+        # frames with reused metrics carry details['metrics_reused'] = True.
+        # noise_fast_gate_pct <= 0 disables the gate
+        self.fast_gate_pct = float(config.get('noise_fast_gate_pct', 0))
+        self.gate_min_history = 3
+        self._full_every_n = 30
+        self._frames_since_full = 0
+        self._last_full_metrics = None
+        self._last_full_variance = 0.0
+        
+        # Full-frame Laplacian statistics (noise variance, local and color
+        # noise) run on a CUDA device through CuPy when requested and present
+        self._use_cupy = False
+        if cupy is not None and config.get('enable_gpu', False):
+            try:
+                self._use_cupy = cupy.cuda.runtime.getDeviceCount() > 0
+            except cupy.cuda.runtime.CUDARuntimeError as e:
+                logger.debug(f"No CUDA device, noise analysis stays on the CPU: {e}")
+        
+        # Per-thread float32 filter outputs reused across frames
+        # (analyze_frame may run concurrently on one instance)
+        self._scratch_local = threading.local()
+    
+    def close(self):
+        """
+        Shut down the subtask pool.
+        
+        Safe to call more than once; frames analyzed afterwards run their
+        subtasks inline.
+        """
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+    
+    def __enter__(self) -> 'NoiseAnalyzer':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def analyze_frame(self, frame: np.ndarray, timestamp: float) -> Optional[Dict[str, Any]]:
         """
@@ -32,15 +137,70 @@ class NoiseAnalyzer:
             frame: RGB frame data as numpy array
             timestamp: Frame timestamp in seconds
             
+        Returns:
+            Dictionary containing noise analysis results
+        """
+        return self._analyze_frame(frame, timestamp)
+    
+    def analyze_frames(self, frames: Sequence[np.ndarray], timestamps: Sequence[float]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analyze a batch of consecutive frames.
+        
+        Gives the same results as calling analyze_frame on each frame in
+        order (scoring against the baseline and history stays sequential),
+        but the frequency signatures of the whole batch come from one batched
+        FFT instead of one transform per frame.
+        
+        Args:
+            frames: RGB frames in playback order
+            timestamps: Frame timestamps in seconds
+            
+        Returns:
+            One analyze_frame result per frame (None where analysis failed)
+        """
+        try:
+            grays = [cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY) for frame in frames]
+            frequency_batch = self._analyze_frequency_batch(grays)
+        except Exception as e:
+            logger.debug(f"Batched noise analysis unavailable, analyzing frames one by one: {e}")
+            return [self._analyze_frame(frame, timestamp) for frame, timestamp in zip(frames, timestamps)]
+        
+        return [
+            self._analyze_frame(frame, timestamp, gray, frequency_metrics)
+            for frame, timestamp, gray, frequency_metrics in zip(frames, timestamps, grays, frequency_batch)
+        ]
+    
+    def _analyze_frame(self, frame: np.ndarray, timestamp: float, gray: Optional[np.ndarray] = None,
+                       frequency_metrics: Optional[Dict[str, float]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Analyze one frame, optionally with batch-computed inputs.
+        
+        Args:
+            frame: RGB frame data as numpy array
+            timestamp: Frame timestamp in seconds
+            gray: Grayscale frame, when already converted
+            frequency_metrics: Frequency analysis of the frame, when already
+                computed
+            
         Returns:
             Dictionary containing noise analysis results
         """
         try:
             # Convert to grayscale for noise analysis
-            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+            if gray is None:
+                gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
             
-            # Calculate comprehensive noise metrics
-            noise_metrics = self._calculate_noise_metrics(gray, frame)
+            # Stage 1: cheap global noise statistics, which decide whether the
+            # expensive metrics need recomputing
+            cheap_metrics = self._calculate_cheap_metrics(gray)
+            reuse = self._fast_path_metrics(cheap_metrics)
+            
+            # Stage 2: comprehensive noise metrics
+            noise_metrics = self._calculate_noise_metrics(gray, frame, cheap_metrics, reuse, frequency_metrics)
+            if reuse is None:
+                self._last_full_metrics = {key: noise_metrics[key] for key in self.EXPENSIVE_KEYS}
+                self._last_full_variance = noise_metrics['noise_variance']
+                self._frames_since_full = 0
             
             # Detect noise pattern changes
             pattern_analysis = self._analyze_noise_patterns(noise_metrics)
@@ -64,7 +224,8 @@ class NoiseAnalyzer:
                     'noise_pattern_change': pattern_analysis['pattern_change'],
                     'variance_change_percent': pattern_analysis.get('variance_change_percent', 0),
                     'frequency_correlation': pattern_analysis.get('frequency_correlation', 1.0),
-                    'texture_consistency': pattern_analysis.get('texture_consistency', 1.0)
+                    'texture_consistency': pattern_analysis.get('texture_consistency', 1.0),
+                    'metrics_reused': reuse is not None
                 }
             }
             
@@ -74,49 +235,197 @@ class NoiseAnalyzer:
             logger.error(f"Noise analysis failed at {timestamp:.1f}s: {e}")
             return None
     
-    def _calculate_noise_metrics(self, gray: np.ndarray, color_frame: np.ndarray) -> Dict[str, Any]:
-        """Calculate comprehensive noise and texture metrics."""
-        # 1. Basic noise estimation
-        noise_variance = self._estimate_noise_variance(gray)
+    def _calculate_cheap_metrics(self, gray: np.ndarray) -> Dict[str, float]:
+        """
+        Calculate the inexpensive global noise metrics of a frame.
+        
+        Args:
+            gray: Grayscale frame
+            
+        Returns:
+            Dictionary with the noise variance, noise entropy and local noise
+            metrics
+        """
+        # 1. Basic noise estimation; the Laplacian is shared with the local
+        # noise analysis
+        if self._use_cupy:
+            laplacian = self._device_laplacian(gray)
+        else:
+            # OpenCV's float32 Laplacian path is much faster than its
+            # uint8 -> float32 one, so filter an exact float32 copy of gray
+            gray_f32 = self._scratch('gray_f32', gray.shape)
+            np.copyto(gray_f32, gray)
+            laplacian = cv2.Laplacian(gray_f32, cv2.CV_32F, dst=self._scratch('laplacian', gray.shape))
+        noise_variance = self._estimate_noise_variance(gray, laplacian)
         
         # 2. Noise entropy
         noise_entropy = self._calculate_noise_entropy(gray)
         
-        # 3. Frequency domain analysis
-        frequency_metrics = self._analyze_frequency_domain(gray)
+        # 3. Local noise patterns
+        local_noise_metrics = self._analyze_local_noise_patterns(laplacian)
         
-        # 4. Texture analysis
-        texture_metrics = self._analyze_texture_patterns(gray)
+        return {
+            'noise_variance': noise_variance,
+            'noise_entropy': noise_entropy,
+            **local_noise_metrics
+        }
+    
+    def _fast_path_metrics(self, cheap_metrics: Dict[str, float]) -> Optional[Dict[str, float]]:
+        """
+        Decide whether the expensive metrics can be reused for this frame.
         
-        # 5. Compression artifact detection
-        compression_artifacts = self._detect_compression_artifacts(gray)
+        Args:
+            cheap_metrics: Stage-1 metrics of the current frame
+            
+        Returns:
+            Expensive metrics of the last full measurement, or None when the
+            frame needs a full measurement
+        """
+        if (self.fast_gate_pct <= 0
+                or self._last_full_metrics is None
+                or self.baseline_noise is None
+                or self.baseline_noise['noise_variance'] <= 0
+                or self._last_full_variance <= 0
+                or self._history_count < self.gate_min_history
+                or self._frames_since_full + 1 >= self._full_every_n):
+            return None
+        
+        # Percent change against the baseline, and against the frame whose
+        # metrics would be reused (an anomalous frame must not be carried over)
+        last_full_change = (cheap_metrics['noise_variance'] - self._last_full_variance) / self._last_full_variance * 100
+        if (abs(self._calculate_variance_change(cheap_metrics)) > self.fast_gate_pct
+                or abs(last_full_change) > self.fast_gate_pct):
+            return None
+        
+        self._frames_since_full += 1
+        return self._last_full_metrics
+    
+    def _calculate_noise_metrics(self, gray: np.ndarray, color_frame: np.ndarray,
+                                 cheap_metrics: Optional[Dict[str, float]] = None,
+                                 reuse: Optional[Dict[str, float]] = None,
+                                 frequency_metrics: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Calculate comprehensive noise and texture metrics.
         
-        # 6. Color noise analysis
-        color_noise_metrics = self._analyze_color_noise(color_frame)
+        Args:
+            gray: Grayscale frame
+            color_frame: RGB frame
+            cheap_metrics: Stage-1 metrics already computed for this frame
+            reuse: Expensive metrics (EXPENSIVE_KEYS) to reuse instead of
+                recomputing the frequency, texture, artifact and color analyses
+            frequency_metrics: Frequency analysis already computed for this
+                frame
+            
+        Returns:
+            Dictionary of noise metrics
+        """
+        if reuse is None:
+            # Heavy independent analyses start first and overlap with each
+            # other, and with the cheap ones below when those are not given
+            if frequency_metrics is None:
+                frequency_future = self._submit(self._analyze_frequency_domain, gray)
+            texture_future = self._submit(self._analyze_texture_patterns, gray)
+            artifacts_future = self._submit(self._detect_compression_artifacts, gray)
+            color_noise_future = self._submit(self._analyze_color_noise, color_frame)
         
-        # 7. Local noise patterns
-        local_noise_metrics = self._analyze_local_noise_patterns(gray)
+        # 1-3. Noise variance, entropy and local noise patterns
+        if cheap_metrics is None:
+            cheap_metrics = self._calculate_cheap_metrics(gray)
+        
+        if reuse is not None:
+            expensive_metrics = reuse
+        else:
+            # 4. Frequency domain analysis
+            if frequency_metrics is None:
+                frequency_metrics = frequency_future.result()
+            
+            # 5. Texture analysis
+            texture_metrics = texture_future.result()
+            
+            # 6. Compression artifact detection
+            compression_artifacts = artifacts_future.result()
+            
+            # 7. Color noise analysis
+            color_noise_metrics = color_noise_future.result()
+            
+            expensive_metrics = {
+                'frequency_signature': frequency_metrics['signature'],
+                'high_freq_energy': frequency_metrics['high_freq_energy'],
+                'texture_energy': texture_metrics['energy'],
+                'texture_homogeneity': texture_metrics['homogeneity'],
+                'compression_artifacts': compression_artifacts,
+                **color_noise_metrics
+            }
         
         return {
-            'noise_variance': noise_variance,
-            'noise_entropy': noise_entropy,
-            'frequency_signature': frequency_metrics['signature'],
-            'high_freq_energy': frequency_metrics['high_freq_energy'],
-            'texture_energy': texture_metrics['energy'],
-            'texture_homogeneity': texture_metrics['homogeneity'],
-            'compression_artifacts': compression_artifacts,
-            **color_noise_metrics,
-            **local_noise_metrics
+            'noise_variance': cheap_metrics['noise_variance'],
+            'noise_entropy': cheap_metrics['noise_entropy'],
+            **expensive_metrics,
+            'local_noise_uniformity': cheap_metrics['local_noise_uniformity'],
+            'local_noise_mean': cheap_metrics['local_noise_mean']
         }
     
-    def _estimate_noise_variance(self, gray: np.ndarray) -> float:
-        """Estimate noise variance using Laplacian method."""
+    def _submit(self, fn, *args) -> Future:
+        """Run fn on the subtask pool, or inline when the pool is disabled."""
+        if self._pool is not None:
+            return self._pool.submit(fn, *args)
+        
+        future = Future()
         try:
-            # Apply Laplacian filter to estimate noise
-            laplacian = cv2.Laplacian(gray, cv2.CV_64F)
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def _scratch(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Return this thread's float32 scratch array for a filter output.
+        
+        Args:
+            name: Buffer name
+            shape: Required shape
             
-            # Estimate noise variance
-            noise_variance = np.var(laplacian) / 6.0  # Normalize
+        Returns:
+            Reusable array, reallocated only when the shape changes
+        """
+        buffers = getattr(self._scratch_local, 'buffers', None)
+        if buffers is None:
+            buffers = self._scratch_local.buffers = {}
+        
+        buffer = buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = buffers[name] = np.empty(shape, dtype=np.float32)
+        return buffer
+    
+    def _device_laplacian(self, image: np.ndarray) -> 'cupy.ndarray':
+        """
+        cv2.Laplacian (3x3 aperture, reflect-101 borders) on the CUDA device.
+        
+        Args:
+            image: uint8 grayscale or multi-channel frame on the host
+            
+        Returns:
+            float32 CuPy array with the per-channel Laplacian
+        """
+        # Upload as uint8 (a quarter of the float32 traffic), cast on device
+        device_image = cupy.asarray(image).astype(cupy.float32)
+        kernel = self._laplacian_kernel if image.ndim == 2 else self._laplacian_kernel[:, :, None]
+        return cupy_ndimage.correlate(device_image, cupy.asarray(kernel), mode='mirror')
+    
+    def _estimate_noise_variance(self, gray: np.ndarray, laplacian: Optional[np.ndarray] = None) -> float:
+        """Estimate noise variance using Laplacian method."""
+        try:
+            # Apply Laplacian filter to estimate noise (integer-valued, exact
+            # in float32)
+            if laplacian is None:
+                laplacian = cv2.Laplacian(gray, cv2.CV_32F)
+            
+            # Estimate noise variance; one pass with double accumulation
+            if cupy is not None and isinstance(laplacian, cupy.ndarray):
+                std_dev = float(laplacian.std(dtype=cupy.float64))
+            else:
+                std_dev = cv2.meanStdDev(laplacian)[1][0, 0]
+            noise_variance = std_dev**2 / 6.0  # Normalize
             
             return float(noise_variance)
             
@@ -126,57 +435,162 @@ class NoiseAnalyzer:
     def _calculate_noise_entropy(self, gray: np.ndarray) -> float:
         """Calculate entropy of noise patterns."""
         try:
-            # Apply high-pass filter to isolate noise
-            kernel = np.array([[-1, -1, -1], [-1, 8, -1], [-1, -1, -1]])
-            noise_image = cv2.filter2D(gray, cv2.CV_64F, kernel)
-            
-            # Calculate histogram of noise
-            noise_hist, _ = np.histogram(noise_image.flatten(), bins=64, density=True)
+            # High-pass filter response to isolate noise, counted per integer
+            # value in one pass without building the filtered image
+            value_counts = highpass_hist(gray)
+            present = np.flatnonzero(value_counts)
+            values = present - HIGHPASS_MAX
+            
+            # Calculate histogram of noise: 64 bins over the response's
+            # min..max, binned from the per-value counts (np.histogram's
+            # half-open bins, last bin closed, via searchsorted + bincount)
+            low, high = values[0], values[-1]
+            if low == high:
+                # Single response value: widen like np.histogram does
+                low, high = low - 0.5, high + 0.5
+            bin_edges = np.linspace(low, high, 65)
+            bin_index = np.minimum(np.searchsorted(bin_edges, values, side='right') - 1, 63)
+            bin_counts = np.bincount(bin_index, weights=value_counts[present], minlength=64)
+            noise_hist = bin_counts / np.diff(bin_edges) / bin_counts.sum()  # Density
             noise_hist = noise_hist + 1e-10  # Avoid log(0)
             
-            # Calculate entropy
-            entropy = -np.sum(noise_hist * np.log2(noise_hist))
+            # Calculate entropy in bits (natural log scaled by 1/ln 2)
+            entropy = -(noise_hist @ np.log(noise_hist)) / np.log(2.0)
             
             return float(entropy)
             
         except Exception:
             return 0.0
     
+    def _frequency_weights(self, h: int, w: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Weights that turn real-FFT half-spectrum sums into full-spectrum sums.
+        
+        Each rfft2 column except DC (and Nyquist, for even widths) stands for
+        itself and its conjugate mirror, so it counts twice. The inner disc
+        (radius min(h, w) // 4 around the zero frequency of the shifted
+        spectrum) is symmetric under that mirror, so the split carries over.
+        
+        Returns:
+            Flattened weight vectors over the rfft2 output whose dot products
+            with the magnitude give the full-spectrum mean and the mean
+            outside the inner disc
+        """
+        key = (h, w)
+        if key not in self._freq_weights:
+            fy = np.fft.fftfreq(h, 1.0 / h)[:, None]
+            fx = np.arange(w // 2 + 1)[None, :]
+            inner = fy**2 + fx**2 <= (min(h, w) // 4)**2
+            
+            weights = np.full((h, w // 2 + 1), 2.0)
+            weights[:, 0] = 1.0
+            if w % 2 == 0:
+                weights[:, -1] = 1.0
+            
+            outer_weights = np.where(inner, 0.0, weights)
+            n_outer = outer_weights.sum()
+            self._freq_weights[key] = (
+                (weights / (h * w)).ravel(),
+                (outer_weights / n_outer if n_outer else np.full_like(weights, np.nan)).ravel()
+            )
+        return self._freq_weights[key]
+    
+    def _rfft2(self, image: np.ndarray, workers: int = 1) -> np.ndarray:
+        """
+        2-D real-input FFT over the last two axes, in single precision.
+        
+        float32 input halves the transform's memory traffic (a complex64
+        spectrum), and its rounding is far below what the frequency
+        signature resolves. Uses a planned pyFFTW transform per thread and
+        shape when pyFFTW is installed (plans are not safe to execute
+        concurrently), and SciPy's FFT otherwise. FFT_SIZE is a power of two,
+        so no padding to a fast length is needed.
+        
+        Args:
+            image: 2-D image, or a stack of images
+            workers: Threads for the transform; single-threaded by default
+                since frames and subtasks already run in parallel
+            
+        Returns:
+            complex64 half spectrum, as scipy.fft.rfft2 returns it; with
+            pyFFTW this is the plan's output buffer, overwritten by the
+            thread's next call
+        """
+        if pyfftw is None:
+            return fft.rfft2(image.astype(np.float32, copy=False), workers=workers)
+        
+        plans = getattr(self._scratch_local, 'fftw_plans', None)
+        if plans is None:
+            plans = self._scratch_local.fftw_plans = {}
+        
+        key = (image.shape, workers)
+        plan = plans.get(key)
+        if plan is None:
+            plan = plans[key] = pyfftw.builders.rfft2(
+                pyfftw.empty_aligned(image.shape, dtype=np.float32), threads=workers,
+                planner_effort='FFTW_MEASURE'
+            )
+        
+        np.copyto(plan.input_array, image)
+        return plan()
+    
     def _analyze_frequency_domain(self, gray: np.ndarray) -> Dict[str, float]:
         """Analyze frequency domain characteristics."""
-        try:
-            # Apply FFT
-            f_transform = fft.fft2(gray)
-            f_shift = fft.fftshift(f_transform)
-            magnitude_spectrum = np.abs(f_shift)
-            
-            # Calculate frequency signature
-            h, w = magnitude_spectrum.shape
-            center_h, center_w = h // 2, w // 2
-            
-            # High frequency energy (outer regions)
-            mask = np.zeros((h, w), dtype=bool)
-            y, x = np.ogrid[:h, :w]
-            mask_inner = (x - center_w)**2 + (y - center_h)**2 <= (min(h, w) // 4)**2
-            mask[~mask_inner] = True
+        return self._analyze_frequency_batch([gray])[0]
+    
+    def _analyze_frequency_batch(self, grays: Sequence[np.ndarray]) -> List[Dict[str, float]]:
+        """
+        Analyze frequency domain characteristics of several frames at once.
+        
+        Args:
+            grays: Grayscale frames
             
-            high_freq_energy = np.mean(magnitude_spectrum[mask])
-            total_energy = np.mean(magnitude_spectrum)
+        Returns:
+            One frequency analysis per frame
+        """
+        try:
+            # Area-resample to a fixed FFT_SIZE square first: the signature is
+            # an inner/outer energy ratio, which AREA resampling preserves well
+            # enough for baseline comparison, and a fixed size makes it
+            # independent of the source resolution
+            size = self.FFT_SIZE
+            batch = np.empty((len(grays), size, size), dtype=np.uint8)
+            for plane, gray in zip(batch, grays):
+                if gray.shape != (size, size):
+                    gray = cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA)
+                plane[...] = gray
+            
+            # Real-input FFT over the last two axes: half the spectrum of a
+            # full fft2, no shift needed. A batch spreads its planes over the
+            # available cores
+            workers = min(len(grays), os.cpu_count() or 1)
+            magnitude_spectra = np.abs(self._rfft2(batch, workers)).reshape(len(grays), -1)
+            
+            # High frequency energy (outside the inner disc) vs all frequencies
+            mean_weights, outer_mean_weights = self._frequency_weights(size, size)
+            high_freq_energy = magnitude_spectra @ outer_mean_weights
+            total_energy = magnitude_spectra @ mean_weights
             
             frequency_signature = high_freq_energy / (total_energy + 1e-10)
             
-            return {
-                'signature': float(frequency_signature),
-                'high_freq_energy': float(high_freq_energy),
-                'total_energy': float(total_energy)
-            }
+            return [
+                {
+                    'signature': float(frequency_signature[i]),
+                    'high_freq_energy': float(high_freq_energy[i]),
+                    'total_energy': float(total_energy[i])
+                }
+                for i in range(len(grays))
+            ]
             
         except Exception:
-            return {
-                'signature': 0.0,
-                'high_freq_energy': 0.0,
-                'total_energy': 0.0
-            }
+            return [
+                {
+                    'signature': 0.0,
+                    'high_freq_energy': 0.0,
+                    'total_energy': 0.0
+                }
+                for _ in grays
+            ]
     
     def _analyze_texture_patterns(self, gray: np.ndarray) -> Dict[str, float]:
         """Analyze texture patterns using GLCM and LBP."""
@@ -210,20 +624,18 @@ class NoiseAnalyzer:
             # Reduce image size for faster computation
             small_gray = cv2.resize(gray, (128, 128))
             
-            # Calculate GLCM using skimage
-            from skimage.feature import graycomatrix, graycoprops
-            
             # Quantize to reduce computation
             quantized = (small_gray // 32).astype(np.uint8)
             
-            # Calculate GLCM
-            glcm = graycomatrix(quantized, [1], [0, np.pi/4, np.pi/2, 3*np.pi/4], 
-                              levels=8, symmetric=True, normed=True)
+            # Symmetric GLCM at distance 1 for 0, 45, 90 and 135 degrees,
+            # normalized per angle
+            counts = glcm4(quantized, self.GLCM_LEVELS)
+            glcm = counts / counts.sum(axis=(1, 2), keepdims=True)
             
-            # Calculate properties
-            energy = np.mean(graycoprops(glcm, 'energy'))
-            homogeneity = np.mean(graycoprops(glcm, 'homogeneity'))
-            contrast = np.mean(graycoprops(glcm, 'contrast'))
+            # Calculate properties (graycoprops definitions), averaged over angles
+            energy = np.mean(np.sqrt(np.sum(glcm * glcm, axis=(1, 2))))
+            homogeneity = np.mean(np.sum(glcm / (1.0 + self._glcm_diff_sq), axis=(1, 2)))
+            contrast = np.mean(np.sum(glcm * self._glcm_diff_sq, axis=(1, 2)))
             
             return {
                 'energy': float(energy),
@@ -240,16 +652,12 @@ class NoiseAnalyzer:
             # Reduce image size for faster computation
             small_gray = cv2.resize(gray, (128, 128))
             
-            # Calculate LBP
-            from skimage.feature import local_binary_pattern
-            
-            radius = 3
-            n_points = 8 * radius
-            lbp = local_binary_pattern(small_gray, n_points, radius, method='uniform')
-            
-            # Calculate LBP histogram
-            lbp_hist, _ = np.histogram(lbp.ravel(), bins=n_points + 2, 
-                                     range=(0, n_points + 2), density=True)
+            # Uniform LBP code histogram (10 codes, one bin each). The 3x3,
+            # 8-neighbour LBP approximates the radius-3, 24-point one closely
+            # enough for texture-consistency scoring, at one table lookup
+            # per pixel instead of 24 bilinear samples
+            lbp_counts = lbp_uniform_hist(small_gray)
+            lbp_hist = lbp_counts / lbp_counts.sum()
             
             # Calculate uniformity and variance
             uniformity = np.sum(lbp_hist**2)
@@ -285,28 +693,19 @@ class NoiseAnalyzer:
         try:
             h, w = gray.shape
             
-            # Calculate horizontal and vertical differences at block boundaries
-            horizontal_diffs = []
-            vertical_diffs = []
-            
-            # Check 8-pixel boundaries (typical DCT block size)
-            for i in range(8, h, 8):
-                if i < h - 1:
-                    diff = np.mean(np.abs(gray[i, :] - gray[i-1, :]))
-                    horizontal_diffs.append(diff)
-            
-            for j in range(8, w, 8):
-                if j < w - 1:
-                    diff = np.mean(np.abs(gray[:, j] - gray[:, j-1]))
-                    vertical_diffs.append(diff)
+            # Absolute differences across every 8-pixel boundary (typical DCT
+            # block size) below the last row/column, in int16 so uint8
+            # subtraction does not wrap
+            horizontal_diffs = np.abs(gray[8:h - 1:8].astype(np.int16) - gray[7:h - 2:8])
+            vertical_diffs = np.abs(gray[:, 8:w - 1:8].astype(np.int16) - gray[:, 7:w - 2:8])
             
             # Calculate blocking score
-            if horizontal_diffs and vertical_diffs:
-                avg_block_diff = (np.mean(horizontal_diffs) + np.mean(vertical_diffs)) / 2.0
+            if horizontal_diffs.size and vertical_diffs.size:
+                avg_block_diff = (horizontal_diffs.mean() + vertical_diffs.mean()) / 2.0
                 
                 # Compare with overall image variation
-                overall_variation = np.std(gray)
-                blocking_score = avg_block_diff / (overall_variation + 1e-10)
+                _, overall_variation = cv2.meanStdDev(gray)
+                blocking_score = avg_block_diff / (overall_variation[0, 0] + 1e-10)
                 
                 return min(1.0, blocking_score)
             
@@ -321,19 +720,20 @@ class NoiseAnalyzer:
             # Detect edges
             edges = cv2.Canny(gray, 50, 150)
             
+            # Flat frames (fades, black frames) have no edge regions to scan
+            if cv2.countNonZero(edges) == 0:
+                return 0.0
+            
             # Dilate edges to create a mask
-            kernel = np.ones((5, 5), np.uint8)
-            edge_mask = cv2.dilate(edges, kernel, iterations=1)
+            edge_mask = cv2.dilate(edges, self._edge_dilate_kernel, iterations=1)
             
-            # Calculate gradient magnitude
-            grad_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-            grad_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-            gradient_magnitude = np.sqrt(grad_x**2 + grad_y**2)
+            # Gradient magnitude statistics in edge regions, evaluated only
+            # at masked pixels
+            count, mean_gradient, std_gradient = masked_sobel_stats(gray, edge_mask)
             
             # Calculate ringing score in edge regions
-            if np.sum(edge_mask) > 0:
-                edge_gradient = gradient_magnitude[edge_mask > 0]
-                ringing_score = np.std(edge_gradient) / (np.mean(edge_gradient) + 1e-10)
+            if count > 0:
+                ringing_score = std_gradient / (mean_gradient + 1e-10)
                 return min(1.0, ringing_score / 10.0)  # Normalize
             
             return 0.0
@@ -344,13 +744,16 @@ class NoiseAnalyzer:
     def _analyze_color_noise(self, color_frame: np.ndarray) -> Dict[str, float]:
         """Analyze noise patterns in color channels."""
         try:
-            # Calculate noise in each color channel
-            channel_noise = []
-            
-            for i in range(3):  # RGB channels
-                channel = color_frame[:, :, i]
-                noise_var = self._estimate_noise_variance(channel)
-                channel_noise.append(noise_var)
+            # Calculate noise in each color channel: one Laplacian over the
+            # interleaved RGB frame and one per-channel meanStdDev pass, the
+            # same estimate as _estimate_noise_variance per channel
+            if self._use_cupy:
+                laplacian = self._device_laplacian(color_frame)
+                channel_noise = (laplacian.reshape(-1, 3).var(axis=0, dtype=cupy.float64) / 6.0).get()
+            else:
+                laplacian = cv2.Laplacian(color_frame, cv2.CV_32F, dst=self._scratch('color_laplacian', color_frame.shape))
+                _, std_dev = cv2.meanStdDev(laplacian)
+                channel_noise = std_dev.ravel()**2 / 6.0
             
             # Calculate color noise metrics
             color_noise_variance = np.var(channel_noise)
@@ -373,23 +776,31 @@ class NoiseAnalyzer:
                 'b_noise': 0.0
             }
     
-    def _analyze_local_noise_patterns(self, gray: np.ndarray) -> Dict[str, float]:
-        """Analyze local noise patterns across the image."""
+    def _analyze_local_noise_patterns(self, laplacian: np.ndarray) -> Dict[str, float]:
+        """Analyze local noise patterns across the image from its Laplacian (NumPy or CuPy)."""
         try:
-            # Divide image into blocks
-            h, w = gray.shape
-            block_size = 32
-            local_variances = []
+            xp = cupy.get_array_module(laplacian) if cupy is not None else np
             
-            for i in range(0, h - block_size, block_size):
-                for j in range(0, w - block_size, block_size):
-                    block = gray[i:i+block_size, j:j+block_size]
-                    block_noise = self._estimate_noise_variance(block)
-                    local_variances.append(block_noise)
+            # Tile the frame-wide Laplacian into 32x32 blocks (same block grid
+            # as before: blocks start below h - block_size and w - block_size)
+            h, w = laplacian.shape
+            block_size = 32
+            n_rows = len(range(0, h - block_size, block_size))
+            n_cols = len(range(0, w - block_size, block_size))
             
-            if local_variances:
-                local_noise_uniformity = 1.0 / (1.0 + np.std(local_variances))
-                local_noise_mean = np.mean(local_variances)
+            if n_rows and n_cols:
+                blocks = laplacian[:n_rows * block_size, :n_cols * block_size].reshape(
+                    n_rows, block_size, n_cols, block_size
+                )
+                
+                # Per-block variance as E[x^2] - E[x]^2, normalized like
+                # _estimate_noise_variance
+                block_mean = blocks.mean(axis=(1, 3))
+                block_mean_sq = xp.einsum('ijkl,ijkl->ik', blocks, blocks) / (block_size * block_size)
+                local_variances = (block_mean_sq - block_mean * block_mean) / 6.0
+                
+                local_noise_uniformity = 1.0 / (1.0 + local_variances.std())
+                local_noise_mean = local_variances.mean()
                 
                 return {
                     'local_noise_uniformity': float(local_noise_uniformity),
@@ -503,12 +914,22 @@ class NoiseAnalyzer:
     
     def _update_noise_history(self, noise_metrics: Dict[str, Any], timestamp: float):
         """Update noise history for temporal analysis."""
-        self.noise_history.append({
-            'timestamp': timestamp,
-            'metrics': noise_metrics
-        })
-        
-        # Keep only recent history
-        if len(self.noise_history) > self.max_history:
-            self.noise_history.pop(0)
+        self._history[self._history_pos] = (timestamp, *(noise_metrics[name] for name in self.HISTORY_FIELDS))
+        
+        # Overwrite the oldest entry once the buffer is full
+        self._history_pos = (self._history_pos + 1) % self.max_history
+        self._history_count = min(self._history_count + 1, self.max_history)
+    
+    @property
+    def noise_history(self) -> np.ndarray:
+        """
+        Recent frames, oldest first.
+        
+        Returns:
+            Structured array (HISTORY_DTYPE) with one field per metric, so
+            temporal statistics are plain column reductions
+        """
+        if self._history_count < self.max_history:
+            return self._history[:self._history_count]
+        return np.roll(self._history, -self._history_pos)
 
@@ -6,25 +6,151 @@ Detects motion discontinuities and temporal inconsistencies that may indicate
 video splicing through optical flow analysis and motion vector examination.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import cv2
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, NamedTuple, Optional, Sequence
 import logging
 
+from ._kernels import direction_consistency, flow_stats
+
 logger = logging.getLogger(__name__)
 
+# Farneback and PyrLK dispatch to OpenCV's SIMD kernels only with
+# optimizations enabled
+cv2.setUseOptimized(True)
+
+def _opencv_cpu_features() -> str:
+    """
+    SIMD baseline and dispatched instruction sets of the OpenCV build.
+    
+    Returns:
+        Summary such as "baseline SSE SSE2 SSE3; dispatched SSE4_1 AVX2"
+    """
+    features = {}
+    for line in cv2.getBuildInformation().splitlines():
+        key, _, value = line.strip().partition(':')
+        if key in ('Baseline', 'Dispatched code generation') and key not in features:
+            features[key] = value.strip()
+    return f"baseline {features.get('Baseline', 'unknown')}; dispatched {features.get('Dispatched code generation', 'none')}"
+
+def _cuda_available() -> bool:
+    """Whether this OpenCV build has CUDA support and sees a CUDA device."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+class FlowResult(NamedTuple):
+    """
+    Optical flow analysis result of one frame.
+    
+    A flat tuple rather than a nested dict, so per-frame results are cheap to
+    build and a list of them reads column by column. get() and details keep
+    the dictionary interface of the other analyzers' results.
+    """
+    confidence: float
+    evidence_type: str
+    anomaly_score: float
+    flow_magnitude_mean: float
+    flow_magnitude_std: float
+    flow_direction_consistency: float
+    motion_vector_count: int
+    flow_discontinuity: bool
+    magnitude_change_percent: float
+    direction_change_score: float
+    
+    @property
+    def details(self) -> Dict[str, Any]:
+        """Per-frame flow measurements, keyed as in the legacy result dict."""
+        return dict(zip(self._fields[3:], self[3:]))
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dictionary-style access to confidence, evidence_type, anomaly_score and details."""
+        if key in ('confidence', 'evidence_type', 'anomaly_score', 'details'):
+            return getattr(self, key)
+        return default
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Legacy nested result dictionary."""
+        return {
+            'confidence': self.confidence,
+            'evidence_type': self.evidence_type,
+            'anomaly_score': self.anomaly_score,
+            'details': self.details
+        }
+
+# Per-process analyzer used by analyze_frames workers
+_worker_analyzer = None
+
+def _init_flow_worker(config: Dict[str, Any]):
+    """Build the worker process's analyzer, single-threaded and CPU-only."""
+    global _worker_analyzer
+    _worker_analyzer = OpticalFlowAnalyzer({**config, 'cv_threads': 1, 'enable_gpu': False, 'flow_workers': 1})
+
+def _measure_flow_chunk(grays: List[np.ndarray]) -> List[Dict[str, float]]:
+    """Flow metrics of each consecutive pair in a chunk of grayscale frames."""
+    return [_worker_analyzer._calculate_optical_flow(prev, curr) for prev, curr in zip(grays[:-1], grays[1:])]
+
 class OpticalFlowAnalyzer:
     """Analyzes optical flow patterns to detect temporal discontinuities."""
     
+    # Per-frame record kept in the history ring buffer; float64 so the
+    # previous frame's metrics compare exactly as computed
+    HISTORY_FIELDS = (
+        'magnitude_mean', 'magnitude_std', 'magnitude_max', 'direction_consistency',
+        'vector_count', 'tracking_success_rate', 'dense_magnitude_mean', 'dense_magnitude_std',
+        'dense_direction_consistency', 'motion_coverage', 'flow_uniformity'
+    )
+    HISTORY_DTYPE = np.dtype([('timestamp', np.float64)] + [(name, np.float64) for name in HISTORY_FIELDS])
+    
+    # Cells per side of the grid that spreads re-detected corners
+    FEATURE_GRID = 8
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.previous_frame = None
-        self.flow_history = []
         self.max_history = 5
         
+        # Fixed-size ring buffer of recent frames (struct of arrays)
+        self._history = np.zeros(self.max_history, dtype=self.HISTORY_DTYPE)
+        self._history_count = 0
+        self._history_pos = 0
+        
+        # Running sums of each metric over the buffered frames, updated as
+        # rows enter and leave, so window statistics cost O(1) per frame.
+        # _history_values views the metric columns of the buffer as floats
+        self._history_values = self._history.view(np.float64).reshape(self.max_history, -1)[:, 1:]
+        self._history_sum = np.zeros(len(self.HISTORY_FIELDS))
+        self._history_sumsq = np.zeros(len(self.HISTORY_FIELDS))
+        
+        # OpenCV worker threads for Farneback/PyrLK. The setting is
+        # process-wide, so it is only changed when cv_threads is given (e.g.
+        # 1 when analyzers already run on an outer thread pool)
+        self.num_threads = config.get('cv_threads')
+        if self.num_threads is not None:
+            cv2.setNumThreads(int(self.num_threads))
+        logger.info(f"Optical flow on OpenCV {cv2.__version__} ({_opencv_cpu_features()}), "
+                    f"{cv2.getNumThreads()} threads")
+        
+        # Flow runs on grayscale frames downscaled by flow_scale (INTER_AREA);
+        # windows and distances below shrink with it, and measured vectors are
+        # scaled back to full-resolution pixels so thresholds keep their meaning
+        self.flow_scale = float(config.get('flow_scale', 0.5))
+        self._vector_scale = 1.0 / self.flow_scale
+        
+        # Dense flow method on the CPU: 'dis' (Dense Inverse Search, fast
+        # preset; about 10x faster than Farneback here) or 'farneback'
+        self.dense_method = config.get('dense_flow_method', 'dis')
+        if self.dense_method == 'dis':
+            self._dis = cv2.DISOpticalFlow_create(cv2.DISOpticalFlow_PRESET_FAST)
+        
+        # Farneback window size
+        self.farneback_winsize = self._scaled_window(15)
+        
         # Lucas-Kanade parameters
         self.lk_params = dict(
-            winSize=(15, 15),
+            winSize=(self._scaled_window(15), self._scaled_window(15)),
             maxLevel=2,
             criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
         )
@@ -33,11 +159,80 @@ class OpticalFlowAnalyzer:
         self.feature_params = dict(
             maxCorners=100,
             qualityLevel=0.3,
-            minDistance=7,
-            blockSize=7
+            minDistance=7 * self.flow_scale,
+            blockSize=self._scaled_window(7)
         )
+        
+        # Tracked-KLT feature reuse: corners tracked into a frame are the
+        # starting points for the next pair, and detection only runs when
+        # fewer than half of maxCorners survive, topping up the cells of a
+        # FEATURE_GRID x FEATURE_GRID grid that hold under their share of
+        # points. flow_track_features=False detects afresh every frame
+        self.track_features = config.get('flow_track_features', True)
+        self.min_tracked_points = self.feature_params['maxCorners'] // 2
+        self._cell_capacity = -(-self.feature_params['maxCorners'] // self.FEATURE_GRID ** 2)
+        self._tracked_points = None
+        self._tracked_frame = None
+        self._feature_mask = None
+        
+        # Reused PyrLK outputs, sliced to the number of tracked corners
+        self._p1_buf = np.empty((self.feature_params['maxCorners'], 1, 2), dtype=np.float32)
+        self._status_buf = np.empty((self.feature_params['maxCorners'], 1), dtype=np.uint8)
+        self._err_buf = np.empty((self.feature_params['maxCorners'], 1), dtype=np.float32)
+        
+        # Static-frame early exit: when fewer than flow_static_fraction of
+        # the pixels change by more than _static_diff_level gray levels,
+        # dense flow is skipped and reported as no motion. Sparse flow still
+        # runs, since its vector count and tracking rate drive the score.
+        # flow_static_fraction <= 0 disables the check
+        self.static_fraction = float(config.get('flow_static_fraction', 0.001))
+        self._static_diff_level = 5
+        
+        # analyze_frames measures frame pairs on a persistent pool of
+        # flow_workers processes, created on first use and shut down by
+        # close(). Opt-in: each chunk restarts feature tracking from fresh
+        # corners, so the sparse metrics differ from the serial path. The
+        # default of 1 measures inline and matches analyze_frame exactly
+        self.flow_workers = int(config.get('flow_workers', 1))
+        self._process_pool = None
+        
+        # Dense Farneback flow and corner detection run through cv2.cuda when
+        # requested (enable_gpu) and available; each grayscale frame is
+        # uploaded once and stays resident while it is the previous frame
+        self.backend = 'cuda' if config.get('enable_gpu', False) and _cuda_available() else 'cpu'
+        self._gpu_frames = []
+        if self.backend == 'cuda':
+            self._cuda_farneback = cv2.cuda_FarnebackOpticalFlow.create(
+                numLevels=3, pyrScale=0.5, fastPyramids=False, winSize=self.farneback_winsize,
+                numIters=3, polyN=5, polySigma=1.2, flags=0
+            )
+            self._cuda_corners = cv2.cuda.createGoodFeaturesToTrackDetector(
+                cv2.CV_8UC1, self.feature_params['maxCorners'], self.feature_params['qualityLevel'],
+                self.feature_params['minDistance'], self.feature_params['blockSize']
+            )
+            logger.info("Optical flow using the CUDA backend")
     
-    def analyze_frame(self, frame: np.ndarray, timestamp: float) -> Optional[Dict[str, Any]]:
+    def close(self):
+        """
+        Shut down the flow worker pool.
+        
+        Safe to call more than once; a later parallel batch starts a new pool.
+        """
+        pool, self._process_pool = self._process_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+    
+    def __enter__(self) -> 'OpticalFlowAnalyzer':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _scaled_window(self, size: int) -> int:
+        """Odd window size covering the same full-resolution extent after downscaling."""
+        return max(3, int(size * self.flow_scale) | 1)
+    
+    def analyze_frame(self, frame: np.ndarray, timestamp: float) -> Optional[FlowResult]:
         """
         Analyze optical flow characteristics of a frame.
         
@@ -46,11 +241,10 @@ class OpticalFlowAnalyzer:
             timestamp: Frame timestamp in seconds
             
         Returns:
-            Dictionary containing optical flow analysis results
+            Optical flow analysis results
         """
         try:
-            # Convert to grayscale for optical flow
-            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+            gray = self._prepare_gray(frame)
             
             if self.previous_frame is None:
                 self.previous_frame = gray
@@ -59,66 +253,137 @@ class OpticalFlowAnalyzer:
             # Calculate optical flow
             flow_metrics = self._calculate_optical_flow(self.previous_frame, gray)
             
-            # Detect motion discontinuities
-            discontinuity_info = self._detect_motion_discontinuities(flow_metrics)
-            
-            # Calculate anomaly score
-            anomaly_score = self._calculate_flow_anomaly_score(flow_metrics)
-            
-            # Update history
-            self._update_flow_history(flow_metrics, timestamp)
+            result = self._score_frame(flow_metrics, timestamp)
             
             # Update previous frame
             self.previous_frame = gray
             
-            result = {
-                'confidence': min(1.0, anomaly_score / 3.0),
-                'evidence_type': 'motion_discontinuity' if discontinuity_info['flow_discontinuity'] else 'normal',
-                'anomaly_score': anomaly_score,
-                'details': {
-                    'flow_magnitude_mean': flow_metrics['magnitude_mean'],
-                    'flow_magnitude_std': flow_metrics['magnitude_std'],
-                    'flow_direction_consistency': flow_metrics['direction_consistency'],
-                    'motion_vector_count': flow_metrics['vector_count'],
-                    'flow_discontinuity': discontinuity_info['flow_discontinuity'],
-                    'magnitude_change_percent': discontinuity_info.get('magnitude_change_percent', 0),
-                    'direction_change_score': discontinuity_info.get('direction_change_score', 0)
-                }
-            }
-            
             return result
             
         except Exception as e:
             logger.error(f"Optical flow analysis failed at {timestamp:.1f}s: {e}")
             return None
     
-    def _create_baseline_result(self) -> Dict[str, Any]:
+    def analyze_frames(self, frames: Sequence[np.ndarray], timestamps: Sequence[float]) -> List[Optional[FlowResult]]:
+        """
+        Analyze a batch of consecutive frames.
+        
+        With the default flow_workers = 1 this is exactly analyze_frame on
+        each frame in order. With flow_workers > 1 (opt-in) the frame pairs
+        are split into one contiguous chunk per worker process, overlapping
+        by one frame so no pair is lost at chunk boundaries, and measured in
+        parallel; scoring against the history stays sequential. With feature
+        tracking on, each chunk starts from freshly detected corners, so the
+        sparse flow metrics near chunk starts differ from the serial path.
+        
+        Args:
+            frames: RGB frames in playback order
+            timestamps: Frame timestamps in seconds
+            
+        Returns:
+            One analyze_frame result per frame (None where analysis failed)
+        """
+        if self.flow_workers <= 1 or len(frames) < 2:
+            return [self.analyze_frame(frame, timestamp) for frame, timestamp in zip(frames, timestamps)]
+        
+        try:
+            grays = [self._prepare_gray(frame) for frame in frames]
+            results = []
+            if self.previous_frame is None:
+                results.append(self._create_baseline_result())
+            else:
+                grays.insert(0, self.previous_frame)
+            
+            # Chunk boundaries over the pairs; chunk i covers frames
+            # bounds[i]..bounds[i + 1] inclusive
+            num_chunks = min(self.flow_workers, len(grays) - 1)
+            bounds = np.linspace(0, len(grays) - 1, num_chunks + 1).astype(int)
+            chunks = [grays[start:stop + 1] for start, stop in zip(bounds[:-1], bounds[1:])]
+            
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.flow_workers, initializer=_init_flow_worker, initargs=(self.config,)
+                )
+            pair_metrics = [metrics for chunk in self._process_pool.map(_measure_flow_chunk, chunks) for metrics in chunk]
+        except Exception as e:
+            logger.debug(f"Parallel optical flow unavailable, analyzing frames one by one: {e}")
+            return [self.analyze_frame(frame, timestamp) for frame, timestamp in zip(frames, timestamps)]
+        
+        self.previous_frame = grays[-1]
+        for flow_metrics, timestamp in zip(pair_metrics, timestamps[len(results):]):
+            try:
+                results.append(self._score_frame(flow_metrics, timestamp))
+            except Exception as e:
+                logger.error(f"Optical flow analysis failed at {timestamp:.1f}s: {e}")
+                results.append(None)
+        
+        return results
+    
+    def _prepare_gray(self, frame: np.ndarray) -> np.ndarray:
+        """Grayscale frame at the flow resolution."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        if self.flow_scale != 1.0:
+            gray = cv2.resize(gray, None, fx=self.flow_scale, fy=self.flow_scale, interpolation=cv2.INTER_AREA)
+        return gray
+    
+    def _score_frame(self, flow_metrics: Dict[str, float], timestamp: float) -> FlowResult:
+        """
+        Score a frame's flow metrics against the flow history.
+        
+        Args:
+            flow_metrics: Metrics of the flow from the previous frame
+            timestamp: Frame timestamp in seconds
+            
+        Returns:
+            Optical flow analysis results
+        """
+        # Detect motion discontinuities
+        discontinuity_info = self._detect_motion_discontinuities(flow_metrics)
+        
+        # Calculate anomaly score
+        anomaly_score = self._calculate_flow_anomaly_score(flow_metrics)
+        
+        # Update history
+        self._update_flow_history(flow_metrics, timestamp)
+        
+        return FlowResult(
+            confidence=min(1.0, anomaly_score / 3.0),
+            evidence_type='motion_discontinuity' if discontinuity_info['flow_discontinuity'] else 'normal',
+            anomaly_score=anomaly_score,
+            flow_magnitude_mean=flow_metrics['magnitude_mean'],
+            flow_magnitude_std=flow_metrics['magnitude_std'],
+            flow_direction_consistency=flow_metrics['direction_consistency'],
+            motion_vector_count=flow_metrics['vector_count'],
+            flow_discontinuity=discontinuity_info['flow_discontinuity'],
+            magnitude_change_percent=discontinuity_info.get('magnitude_change_percent', 0),
+            direction_change_score=discontinuity_info.get('direction_change_score', 0)
+        )
+    
+    def _create_baseline_result(self) -> FlowResult:
         """Create baseline result for first frame."""
-        return {
-            'confidence': 0.0,
-            'evidence_type': 'baseline',
-            'anomaly_score': 0.0,
-            'details': {
-                'flow_magnitude_mean': 0.0,
-                'flow_magnitude_std': 0.0,
-                'flow_direction_consistency': 1.0,
-                'motion_vector_count': 0,
-                'flow_discontinuity': False,
-                'magnitude_change_percent': 0.0,
-                'direction_change_score': 0.0
-            }
-        }
+        return FlowResult(
+            confidence=0.0,
+            evidence_type='baseline',
+            anomaly_score=0.0,
+            flow_magnitude_mean=0.0,
+            flow_magnitude_std=0.0,
+            flow_direction_consistency=1.0,
+            motion_vector_count=0,
+            flow_discontinuity=False,
+            magnitude_change_percent=0.0,
+            direction_change_score=0.0
+        )
     
     def _calculate_optical_flow(self, prev_gray: np.ndarray, curr_gray: np.ndarray) -> Dict[str, float]:
         """Calculate comprehensive optical flow metrics."""
-        # Method 1: Dense optical flow (Farneback)
-        dense_flow = cv2.calcOpticalFlowPyrLK(prev_gray, curr_gray, None, None, **self.lk_params)
-        
-        # Method 2: Sparse optical flow (Lucas-Kanade)
+        # Method 1: Sparse optical flow (Lucas-Kanade)
         sparse_metrics = self._calculate_sparse_flow(prev_gray, curr_gray)
         
-        # Method 3: Dense flow analysis
-        dense_metrics = self._calculate_dense_flow(prev_gray, curr_gray)
+        # Method 2: Dense optical flow (DIS or Farneback), unless nothing moved
+        if self._is_static(prev_gray, curr_gray):
+            dense_metrics = self._get_empty_dense_metrics()
+        else:
+            dense_metrics = self._calculate_dense_flow(prev_gray, curr_gray)
         
         # Combine metrics
         combined_metrics = {
@@ -129,17 +394,32 @@ class OpticalFlowAnalyzer:
         
         return combined_metrics
     
+    def _is_static(self, prev_gray: np.ndarray, curr_gray: np.ndarray) -> bool:
+        """Whether too few pixels changed between the frames for dense flow to find motion."""
+        if self.static_fraction <= 0:
+            return False
+        
+        diff = cv2.absdiff(prev_gray, curr_gray)
+        changed = cv2.countNonZero(cv2.compare(diff, self._static_diff_level, cv2.CMP_GT))
+        return changed < self.static_fraction * diff.size
+    
     def _calculate_sparse_flow(self, prev_gray: np.ndarray, curr_gray: np.ndarray) -> Dict[str, float]:
         """Calculate sparse optical flow using Lucas-Kanade method."""
         try:
-            # Detect features in previous frame
-            p0 = cv2.goodFeaturesToTrack(prev_gray, mask=None, **self.feature_params)
+            # Features in previous frame: surviving tracks, topped up by
+            # detection
+            p0 = self._select_features(prev_gray)
+            self._tracked_points = None
             
             if p0 is None or len(p0) == 0:
                 return self._get_empty_flow_metrics()
             
-            # Calculate optical flow
-            p1, status, error = cv2.calcOpticalFlowPyrLK(prev_gray, curr_gray, p0, None, **self.lk_params)
+            # Calculate optical flow into reused output buffers
+            n = len(p0)
+            p1, status, error = cv2.calcOpticalFlowPyrLK(
+                prev_gray, curr_gray, p0,
+                self._p1_buf[:n], self._status_buf[:n], self._err_buf[:n], **self.lk_params
+            )
             
             # Select good points
             good_new = p1[status == 1]
@@ -148,12 +428,21 @@ class OpticalFlowAnalyzer:
             if len(good_new) == 0:
                 return self._get_empty_flow_metrics()
             
-            # Calculate flow vectors
-            flow_vectors = good_new - good_old
+            # Tracked corners seed the next pair, whose previous frame is
+            # this one
+            if self.track_features:
+                self._tracked_points = good_new.reshape(-1, 1, 2)
+                self._tracked_frame = curr_gray
+            
+            # Calculate flow vectors, in full-resolution pixels, as one
+            # component-major copy whose rows OpenCV takes without copying
+            flow_vectors = (good_new - good_old).T.copy()
+            flow_vectors *= self._vector_scale
             
-            # Calculate metrics
-            magnitudes = np.sqrt(flow_vectors[:, 0]**2 + flow_vectors[:, 1]**2)
-            angles = np.arctan2(flow_vectors[:, 1], flow_vectors[:, 0])
+            # Calculate metrics: magnitude and angle in one SIMD pass
+            magnitudes, angles = cv2.cartToPolar(flow_vectors[0], flow_vectors[1])
+            magnitudes = magnitudes.ravel()
+            angles = angles.ravel()
             
             # Direction consistency (circular variance)
             direction_consistency = self._calculate_direction_consistency(angles)
@@ -163,7 +452,7 @@ class OpticalFlowAnalyzer:
                 'magnitude_std': np.std(magnitudes),
                 'magnitude_max': np.max(magnitudes),
                 'direction_consistency': direction_consistency,
-                'vector_count': len(flow_vectors),
+                'vector_count': flow_vectors.shape[1],
                 'tracking_success_rate': len(good_new) / len(p0)
             }
             
@@ -171,59 +460,130 @@ class OpticalFlowAnalyzer:
             logger.error(f"Sparse flow calculation failed: {e}")
             return self._get_empty_flow_metrics()
     
+    def _select_features(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Corners to track from a frame.
+        
+        Args:
+            gray: Grayscale frame the corners lie in
+            
+        Returns:
+            N x 1 x 2 float32 corner positions (None if nothing was found):
+            the points tracked into this frame when enough survive, otherwise
+            those points plus corners detected in under-populated grid cells
+        """
+        max_corners = self.feature_params['maxCorners']
+        tracked = self._tracked_points if self._tracked_frame is gray else None
+        if tracked is not None and len(tracked) >= self.min_tracked_points:
+            return tracked
+        
+        mask = None
+        if tracked is not None:
+            mask = self._free_cells_mask(gray.shape, tracked)
+            max_corners -= len(tracked)
+        
+        if self.backend == 'cuda':
+            gpu_mask = None
+            if mask is not None:
+                gpu_mask = cv2.cuda_GpuMat()
+                gpu_mask.upload(mask)
+            corners = self._cuda_corners.detect(self._upload(gray), mask=gpu_mask)
+            detected = None if corners.empty() else corners.download().reshape(-1, 1, 2)[:max_corners]
+        else:
+            detected = cv2.goodFeaturesToTrack(gray, mask=mask, **{**self.feature_params, 'maxCorners': max_corners})
+        
+        if tracked is None or detected is None:
+            return detected if tracked is None else tracked
+        return np.concatenate((tracked, detected))
+    
+    def _free_cells_mask(self, shape: tuple, points: np.ndarray) -> np.ndarray:
+        """
+        Detection mask leaving out grid cells that already hold their share of points.
+        
+        Args:
+            shape: Frame shape (rows, columns)
+            points: N x 1 x 2 tracked corner positions
+            
+        Returns:
+            uint8 mask (255 where detection may place corners), reused
+            between calls
+        """
+        h, w = shape
+        grid = self.FEATURE_GRID
+        cols = np.clip((points[:, 0, 0] * (grid / w)).astype(np.intp), 0, grid - 1)
+        rows = np.clip((points[:, 0, 1] * (grid / h)).astype(np.intp), 0, grid - 1)
+        counts = np.bincount(rows * grid + cols, minlength=grid * grid).reshape(grid, grid)
+        free = np.where(counts < self._cell_capacity, 255, 0).astype(np.uint8)
+        
+        if self._feature_mask is None or self._feature_mask.shape != shape:
+            self._feature_mask = np.empty(shape, dtype=np.uint8)
+        cv2.resize(free, (w, h), dst=self._feature_mask, interpolation=cv2.INTER_NEAREST)
+        return self._feature_mask
+    
     def _calculate_dense_flow(self, prev_gray: np.ndarray, curr_gray: np.ndarray) -> Dict[str, float]:
-        """Calculate dense optical flow using Farneback method."""
+        """Calculate dense optical flow using the DIS or Farneback method."""
         try:
             # Calculate dense optical flow
-            flow = cv2.calcOpticalFlowPyrLK(prev_gray, curr_gray, 0.5, 3, 15, 3, 5, 1.2, 0)
+            if self.backend == 'cuda':
+                # The flow field comes back to the host so dense metrics use
+                # the same reductions on both backends
+                flow = self._cuda_farneback.calc(self._upload(prev_gray), self._upload(curr_gray), None).download()
+            elif self.dense_method == 'dis':
+                flow = self._dis.calc(prev_gray, curr_gray, None)
+            else:
+                flow = cv2.calcOpticalFlowFarneback(prev_gray, curr_gray, None, 0.5, 3, self.farneback_winsize, 3, 5, 1.2, 0)
             
-            # Calculate magnitude and angle
-            magnitude, angle = cv2.cartToPolar(flow[..., 0], flow[..., 1])
-            
-            # Calculate metrics
-            magnitude_flat = magnitude.flatten()
-            angle_flat = angle.flatten()
-            
-            # Filter out very small movements (noise)
-            significant_motion = magnitude_flat > 0.5
-            if np.sum(significant_motion) == 0:
+            # Magnitude (in full-resolution pixels) and direction statistics
+            # of the significant motion, filtering out very small movements
+            # (noise), in one sweep over the flow field
+            count, magnitude_mean, magnitude_std, mean_cos, mean_sin = flow_stats(flow, self._vector_scale, 0.5)
+            if count == 0:
                 return self._get_empty_dense_metrics()
             
-            sig_magnitudes = magnitude_flat[significant_motion]
-            sig_angles = angle_flat[significant_motion]
-            
-            # Direction consistency for dense flow
-            direction_consistency = self._calculate_direction_consistency(sig_angles)
+            # Direction consistency for dense flow (resultant length of the
+            # unit direction vectors)
+            direction_consistency = np.sqrt(mean_cos**2 + mean_sin**2)
             
             return {
-                'dense_magnitude_mean': np.mean(sig_magnitudes),
-                'dense_magnitude_std': np.std(sig_magnitudes),
+                'dense_magnitude_mean': magnitude_mean,
+                'dense_magnitude_std': magnitude_std,
                 'dense_direction_consistency': direction_consistency,
-                'motion_coverage': np.sum(significant_motion) / len(magnitude_flat),
-                'flow_uniformity': 1.0 - (np.std(sig_magnitudes) / (np.mean(sig_magnitudes) + 1e-6))
+                'motion_coverage': count / (flow.shape[0] * flow.shape[1]),
+                'flow_uniformity': 1.0 - (magnitude_std / (magnitude_mean + 1e-6))
             }
             
         except Exception as e:
             logger.error(f"Dense flow calculation failed: {e}")
             return self._get_empty_dense_metrics()
     
+    def _upload(self, gray: np.ndarray) -> 'cv2.cuda.GpuMat':
+        """
+        Device copy of a grayscale frame for the CUDA backend.
+        
+        Args:
+            gray: Grayscale frame on the host
+            
+        Returns:
+            GpuMat holding the frame; the last two frames uploaded are kept,
+            so the previous frame is not uploaded again
+        """
+        for host, device in self._gpu_frames:
+            if host is gray:
+                return device
+        
+        device = cv2.cuda_GpuMat()
+        device.upload(gray)
+        self._gpu_frames = (self._gpu_frames + [(gray, device)])[-2:]
+        return device
+    
     def _calculate_direction_consistency(self, angles: np.ndarray) -> float:
         """Calculate direction consistency using circular statistics."""
         if len(angles) == 0:
             return 1.0
         
-        # Convert to unit vectors
-        x_components = np.cos(angles)
-        y_components = np.sin(angles)
-        
-        # Calculate mean direction
-        mean_x = np.mean(x_components)
-        mean_y = np.mean(y_components)
-        
-        # Calculate resultant vector length (consistency measure)
-        resultant_length = np.sqrt(mean_x**2 + mean_y**2)
-        
-        return resultant_length
+        # Resultant length of the unit direction vectors (consistency
+        # measure), accumulated in one compiled pass
+        return direction_consistency(angles)
     
     def _get_empty_flow_metrics(self) -> Dict[str, float]:
         """Return empty metrics for sparse flow."""
@@ -248,11 +608,11 @@ class OpticalFlowAnalyzer:
     
     def _detect_motion_discontinuities(self, flow_metrics: Dict[str, float]) -> Dict[str, Any]:
         """Detect motion discontinuities in flow patterns."""
-        if len(self.flow_history) == 0:
+        if self._history_count == 0:
             return {'flow_discontinuity': False}
         
-        # Compare with previous flow
-        prev_metrics = self.flow_history[-1]['metrics']
+        # Compare with previous flow (the most recently written slot)
+        prev_metrics = self._history[self._history_pos - 1]
         
         # Calculate changes
         magnitude_change = 0
@@ -302,12 +662,56 @@ class OpticalFlowAnalyzer:
     
     def _update_flow_history(self, flow_metrics: Dict[str, float], timestamp: float):
         """Update flow history for temporal analysis."""
-        self.flow_history.append({
-            'timestamp': timestamp,
-            'metrics': flow_metrics
-        })
-        
-        # Keep only recent history
-        if len(self.flow_history) > self.max_history:
-            self.flow_history.pop(0)
+        row = self._history_values[self._history_pos]
+        
+        # Overwrite the oldest entry once the buffer is full
+        if self._history_count == self.max_history:
+            self._history_sum -= row
+            self._history_sumsq -= row * row
+        
+        self._history[self._history_pos] = (timestamp, *(flow_metrics[name] for name in self.HISTORY_FIELDS))
+        self._history_sum += row
+        self._history_sumsq += row * row
+        
+        self._history_pos = (self._history_pos + 1) % self.max_history
+        self._history_count = min(self._history_count + 1, self.max_history)
+        
+        # Re-sum once per lap of the buffer so rounding from the running
+        # updates cannot accumulate over a long video
+        if self._history_pos == 0:
+            values = self._history_values[:self._history_count]
+            self._history_sum = values.sum(axis=0)
+            self._history_sumsq = (values * values).sum(axis=0)
+    
+    @property
+    def flow_history(self) -> np.ndarray:
+        """
+        Recent frames, oldest first.
+        
+        Returns:
+            Structured array (HISTORY_DTYPE) with one field per metric, so
+            temporal statistics are plain column reductions
+        """
+        if self._history_count < self.max_history:
+            return self._history[:self._history_count]
+        return np.roll(self._history, -self._history_pos)
+    
+    @property
+    def flow_history_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Mean and standard deviation of each metric over the flow history.
+        
+        Returns:
+            Dictionary mapping each HISTORY_FIELDS metric to its 'mean' and
+            'std' over the buffered frames (empty before the first frame)
+        """
+        if self._history_count == 0:
+            return {}
+        
+        mean = self._history_sum / self._history_count
+        std = np.sqrt(np.maximum(self._history_sumsq / self._history_count - mean * mean, 0.0))
+        return {
+            name: {'mean': float(m), 'std': float(sd)}
+            for name, m, sd in zip(self.HISTORY_FIELDS, mean, std)
+        }
 
@@ -0,0 +1,117 @@
+"""
+Analysis Pipeline Module
+=======================
+
+Pipelined per-frame analysis. Frame metrics are measured concurrently on a
+thread pool, while scoring against baselines and frame history runs on the
+calling thread in playback order.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import logging
+
+from .compression_analyzer import CompressionAnalyzer
+from .histogram_analyzer import HistogramAnalyzer
+from .frame_context import FrameContext
+
+logger = logging.getLogger(__name__)
+
+class AnalysisPipeline:
+    """
+    Producer/consumer pipeline over the compression and histogram analyzers.
+
+    Measuring a frame only reads the frame, so worker threads handle it in
+    parallel (OpenCV and NumPy release the GIL). Both analyzers are stateful
+    (baseline, history, discontinuity detection against the previous frame),
+    so scoring uses one instance of each and consumes measurements in the
+    order frames were submitted.
+    """
+
+    ANALYZERS = ('compression', 'histogram')
+
+    def __init__(self, config: Dict[str, Any], max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None):
+        """
+        Initialize the analysis pipeline.
+
+        Args:
+            config: Analyzer configuration passed to each analyzer
+            max_workers: Worker threads; defaults to os.cpu_count()
+            max_pending: Frames in flight before the producer waits;
+                defaults to twice the worker count
+        """
+        self.config = config
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.max_workers
+        self.analyzers = {
+            'compression': CompressionAnalyzer(config),
+            'histogram': HistogramAnalyzer(config)
+        }
+
+        logger.info(f"Analysis pipeline initialized with {self.max_workers} workers")
+
+    def run(self, frames: Iterable[Tuple[np.ndarray, float]]) -> List[Dict[str, Any]]:
+        """
+        Analyze a sequence of frames.
+
+        Args:
+            frames: Iterable of (RGB frame, timestamp) pairs in playback order
+
+        Returns:
+            One dictionary per frame, in input order, holding the timestamp and
+            each analyzer's result (None where that analyzer failed)
+        """
+        results = []
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for frame, timestamp in frames:
+                # Bounded queue: drain the oldest frame before reading further
+                if len(pending) >= self.max_pending:
+                    results.append(self._score(*pending.popleft()))
+                pending.append((executor.submit(self._measure_one, frame), timestamp))
+
+            while pending:
+                results.append(self._score(*pending.popleft()))
+
+        return results
+
+    def _measure_one(self, frame: np.ndarray) -> Dict[str, Any]:
+        """Measure one frame with every analyzer, sharing a FrameContext."""
+        ctx = FrameContext(frame)
+        measurements = {}
+
+        for name in self.ANALYZERS:
+            try:
+                measurements[name] = self.analyzers[name].measure_frame(ctx)
+            except Exception as e:
+                measurements[name] = e
+
+        return measurements
+
+    def _score(self, future: Future, timestamp: float) -> Dict[str, Any]:
+        """Score a measured frame in playback order."""
+        result = {'timestamp': timestamp}
+
+        try:
+            measurements = future.result()
+        except Exception as e:
+            logger.error(f"Frame measurement failed at {timestamp:.1f}s: {e}")
+            measurements = {name: e for name in self.ANALYZERS}
+
+        for name in self.ANALYZERS:
+            measurement = measurements[name]
+            try:
+                if isinstance(measurement, Exception):
+                    raise measurement
+                result[name] = self.analyzers[name].score_frame(measurement, timestamp)
+            except Exception as e:
+                logger.error(f"{name.capitalize()} analysis failed at {timestamp:.1f}s: {e}")
+                result[name] = None
+
+        return result
@@ -14,11 +14,345 @@ Date: January 2025
 
 import numpy as np
 import scipy.stats as stats
-from scipy import signal
+from scipy import signal, special
 from typing import Dict, List, Tuple, Optional
 import warnings
 from dataclasses import dataclass
 
+try:
+    from numba import njit
+except ImportError:  # optional dependency
+    njit = None
+
+def _cusum_kernel(standardized: np.ndarray, k: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Two-sided CUSUM recurrence.
+    
+    Args:
+        standardized: Standardized time series
+        k: Reference value (allowance) subtracted at each step
+        
+    Returns:
+        Tuple of (cusum_positive, cusum_negative), both starting at 0
+    """
+    n = standardized.shape[0]
+    cusum_pos = np.zeros(n)
+    cusum_neg = np.zeros(n)
+    
+    # Written as comparisons rather than max/min so NaN steps reset to 0
+    # exactly like max(0, x) and min(0, x)
+    for i in range(1, n):
+        p = cusum_pos[i-1] + standardized[i] - k
+        cusum_pos[i] = p if p > 0 else 0.0
+        q = cusum_neg[i-1] + standardized[i] + k
+        cusum_neg[i] = q if q < 0 else 0.0
+    
+    return cusum_pos, cusum_neg
+
+if njit is not None:
+    # Compiled recurrence; without Numba the same loop runs in Python
+    _cusum_kernel = njit(cache=True)(_cusum_kernel)
+
+def _focus_kernel(standardized: np.ndarray) -> np.ndarray:
+    """
+    FOCuS statistic for a change in mean from a known pre-change mean of 0.
+    
+    At each frame t this is the log-likelihood ratio of a mean shift, maximised
+    over every start tau and every shift size mu:
+    max (S_t - S_tau)^2 / (2 (t - tau)), where S are the cumulative sums.
+    For a fixed mu the cost of start tau is linear in (tau, S_tau), so a start
+    lying off the convex hull of the cumulative-sum path never attains the
+    maximum (functional pruning). Only the lower hull (upward shifts) and upper
+    hull (downward shifts) are kept, built incrementally by the monotone-chain
+    rule; each holds O(log n) points on average.
+    
+    Args:
+        standardized: Standardized time series
+        
+    Returns:
+        Statistic for each frame
+    """
+    n = standardized.shape[0]
+    statistic = np.zeros(n)
+    cumsum = np.zeros(n + 1)
+    lower = np.zeros(n + 1, dtype=np.int64)
+    upper = np.zeros(n + 1, dtype=np.int64)
+    n_lower = 1
+    n_upper = 1
+    
+    for t in range(1, n + 1):
+        s_t = cumsum[t-1] + standardized[t-1]
+        cumsum[t] = s_t
+        
+        best = 0.0
+        for h in range(n_lower):
+            j = lower[h]
+            d = s_t - cumsum[j]
+            if d > 0:
+                v = d * d / (2.0 * (t - j))
+                if v > best:
+                    best = v
+        for h in range(n_upper):
+            j = upper[h]
+            d = s_t - cumsum[j]
+            if d < 0:
+                v = d * d / (2.0 * (t - j))
+                if v > best:
+                    best = v
+        statistic[t-1] = best
+        
+        # Add (t, S_t) to both hulls, dropping starts it makes redundant
+        while n_lower > 1:
+            a = lower[n_lower-2]
+            b = lower[n_lower-1]
+            if (b - a) * (s_t - cumsum[a]) - (cumsum[b] - cumsum[a]) * (t - a) > 0:
+                break
+            n_lower -= 1
+        lower[n_lower] = t
+        n_lower += 1
+        
+        while n_upper > 1:
+            a = upper[n_upper-2]
+            b = upper[n_upper-1]
+            if (b - a) * (s_t - cumsum[a]) - (cumsum[b] - cumsum[a]) * (t - a) < 0:
+                break
+            n_upper -= 1
+        upper[n_upper] = t
+        n_upper += 1
+    
+    return statistic
+
+if njit is not None:
+    _focus_kernel = njit(cache=True)(_focus_kernel)
+
+def _nig_log_predictive(y: float, length: int, total: float, squares: float, log_norm: float,
+                        kappa0: float, alpha0: float, beta0: float) -> float:
+    """
+    Log posterior predictive density of a zero-mean Normal-Inverse-Gamma prior.
+    
+    Args:
+        y: Observation (centred on the prior mean)
+        length: Number of observations in the run
+        total: Sum of the run's observations
+        squares: Sum of squares of the run's observations
+        log_norm: Student-t log normalizing constant for this run length
+        kappa0: Prior mean precision scale
+        alpha0: Prior inverse-gamma shape
+        beta0: Prior inverse-gamma scale
+        
+    Returns:
+        Student-t log density of y under the run's posterior
+    """
+    kappa = kappa0 + length
+    dof = 2.0 * alpha0 + length
+    mu = total / kappa
+    beta = beta0 + 0.5 * (squares - total * mu)
+    scale_sq = 2.0 * beta * (kappa + 1.0) / (dof * kappa)
+    return log_norm - 0.5 * np.log(scale_sq) - 0.5 * (dof + 1.0) * np.log1p((y - mu) ** 2 / (dof * scale_sq))
+
+def _bocpd_kernel(centered: np.ndarray, log_norm: np.ndarray, kappa0: float, alpha0: float, beta0: float,
+                  log_hazard: float, log_survival: float, log_prune: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Adams-MacKay run-length recursion with a Normal-Inverse-Gamma model.
+    
+    Args:
+        centered: Time series centred on the prior mean
+        log_norm: Student-t log normalizing constant indexed by run length
+        kappa0: Prior mean precision scale
+        alpha0: Prior inverse-gamma shape
+        beta0: Prior inverse-gamma scale
+        log_hazard: Log prior probability of a change at each frame
+        log_survival: Log probability of no change at each frame
+        log_prune: Log posterior probability below which a run is discarded
+        
+    Returns:
+        Tuple of (change_probabilities, run_counts): the posterior
+        probability that a new segment starts at each frame, and the number
+        of run lengths still live after pruning at each frame
+    """
+    n = centered.shape[0]
+    change_probabilities = np.zeros(n)
+    run_counts = np.zeros(n, dtype=np.int64)
+    
+    # Prefix sums: the run covering frames [s, t) has sum cs1[t] - cs1[s]
+    # and sum of squares cs2[t] - cs2[s]
+    cs1 = np.zeros(n + 1)
+    cs2 = np.zeros(n + 1)
+    for i in range(n):
+        c = float(centered[i])
+        cs1[i+1] = cs1[i] + c
+        cs2[i+1] = cs2[i] + c * c
+    
+    # Start frame and log posterior probability of each surviving run
+    starts = np.zeros(n, dtype=np.int64)
+    log_r = np.zeros(n)
+    runs = 0
+    
+    for t in range(n):
+        y = float(centered[t])
+        
+        # Every existing run grows under its own posterior predictive; a new
+        # segment starting at this frame is scored under the prior
+        for h in range(runs):
+            s = starts[h]
+            log_r[h] += log_survival + _nig_log_predictive(
+                y, t - s, cs1[t] - cs1[s], cs2[t] - cs2[s], log_norm[t - s], kappa0, alpha0, beta0
+            )
+        starts[runs] = t
+        log_r[runs] = 0.0 if t == 0 else log_hazard + _nig_log_predictive(
+            y, 0, 0.0, 0.0, log_norm[0], kappa0, alpha0, beta0
+        )
+        runs += 1
+        
+        _normalize_log(log_r, runs)
+        change_probabilities[t] = np.exp(log_r[runs-1])
+        
+        # Prune negligible run lengths, keeping the rest in order
+        kept = 0
+        for h in range(runs):
+            if log_r[h] >= log_prune:
+                starts[kept] = starts[h]
+                log_r[kept] = log_r[h]
+                kept += 1
+        if kept < runs:
+            runs = kept
+            _normalize_log(log_r, runs)
+        run_counts[t] = runs
+    
+    return change_probabilities, run_counts
+
+def _normalize_log(log_p: np.ndarray, count: int) -> None:
+    """
+    Normalize log_p[:count] in place so its probabilities sum to one.
+    
+    Args:
+        log_p: Log probabilities
+        count: Number of leading entries in use
+    """
+    peak = -np.inf
+    for h in range(count):
+        if log_p[h] > peak:
+            peak = log_p[h]
+    total = 0.0
+    for h in range(count):
+        total += np.exp(log_p[h] - peak)
+    log_total = peak + np.log(total)
+    for h in range(count):
+        log_p[h] -= log_total
+
+if njit is not None:
+    # Compiled recursion; the helpers are compiled first so the kernel
+    # inlines native calls to them
+    _nig_log_predictive = njit(cache=True)(_nig_log_predictive)
+    _normalize_log = njit(cache=True)(_normalize_log)
+    _bocpd_kernel = njit(cache=True)(_bocpd_kernel)
+
+def _working_dtype(data: np.ndarray) -> type:
+    """
+    Floating-point type for scanning a series.
+    
+    float32 series stay float32, halving memory traffic on long videos;
+    anything else is processed as float64. Kernels accumulate in float64
+    either way.
+    
+    Args:
+        data: Time series data
+        
+    Returns:
+        np.float32 or np.float64
+    """
+    return np.float32 if data.dtype == np.float32 else np.float64
+
+def _quartiles(data: np.ndarray) -> Tuple[float, float, float]:
+    """
+    First quartile, median and third quartile of a 1-D sample.
+    
+    Same values as np.percentile(data, [25, 75]) and np.median(data), from a
+    single np.partition of the six order statistics they interpolate.
+    
+    Args:
+        data: Non-empty sample
+        
+    Returns:
+        Tuple of (q25, median, q75)
+    """
+    n = len(data)
+    positions = np.array([0.25, 0.5, 0.75]) * (n - 1)
+    lo = np.floor(positions).astype(np.intp)
+    hi = np.minimum(lo + 1, n - 1)
+    part = np.partition(data, np.union1d(lo, hi))
+    a, b = part[lo], part[hi]
+    t = positions - lo
+    
+    # np.percentile's linear interpolation, evaluated from the nearer end
+    diff = b - a
+    values = np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+    # np.median averages the two middle values of an even-length sample
+    median = (a[1] + b[1]) / 2 if t[1] else a[1]
+    return values[0], median, values[2]
+
+def _median_mad(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Median and median absolute deviation along the last axis.
+    
+    Same result as np.median plus stats.median_abs_deviation (unscaled),
+    without SciPy's per-call axis/NaN-policy dispatch.
+    
+    Args:
+        data: Array of samples, one series per row
+        
+    Returns:
+        Tuple of (median, mad)
+    """
+    median = np.median(data, axis=-1)
+    mad = np.median(np.abs(data - median[..., None]), axis=-1)
+    return median, mad
+
+@dataclass(slots=True, frozen=True)
+class BaselineStats:
+    """
+    Statistics and properties of the baseline period.
+    
+    Immutable, so one instance is safely shared between every caller of
+    establish_baseline for the same data. Dictionary-style access (``stats['mean']``,
+    ``stats.get('mean')``) is kept for code written against the former dict.
+    """
+    n_samples: int
+    mean: float
+    std: float
+    median: float
+    mad: float
+    q25: float
+    q75: float
+    iqr: float
+    min: float
+    max: float
+    skewness: float
+    kurtosis: float
+    shapiro_stat: float
+    shapiro_p: float
+    is_normal: bool
+    autocorr_lag1: float
+    ljung_box_stat: float
+    ljung_box_p: float
+    has_autocorrelation: bool
+    
+    def __getitem__(self, key: str):
+        # Only dataclass fields are keys; methods and dunders are not
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default=None):
+        """Dictionary-style access to a baseline field."""
+        if key not in self.__dataclass_fields__:
+            return default
+        return getattr(self, key)
+    
+    def to_dict(self) -> Dict:
+        """Baseline fields as a plain dictionary."""
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
 @dataclass
 class StatisticalResult:
     """Container for statistical analysis results."""
@@ -29,29 +363,86 @@ class StatisticalResult:
     effect_size_interpretation: str
     confidence_interval: Tuple[float, float]
     is_significant: bool
-    baseline_properties: Dict
+    baseline_properties: BaselineStats
     assumptions_met: Dict[str, bool]
     limitations: List[str]
 
+@dataclass(slots=True)
+class SignificanceTests:
+    """
+    Significance tests of detected change points, stored column-wise.
+    
+    Row i tests frame frames[i], flagged by methods[i]; results[i] holds its
+    full StatisticalResult. The numeric columns allow filtering and sorting
+    all tests in one vectorized call.
+    """
+    frames: np.ndarray
+    methods: np.ndarray
+    statistics: np.ndarray
+    p_values: np.ndarray
+    effect_sizes: np.ndarray
+    is_significant: np.ndarray
+    results: List[StatisticalResult]
+    
+    @classmethod
+    def from_results(cls, frames: List[int], methods: List[str],
+                     results: List[StatisticalResult]) -> 'SignificanceTests':
+        """
+        Build the columns from per-frame test results.
+        
+        Args:
+            frames: Tested frame indices
+            methods: Detection method that flagged each frame
+            results: Test result for each frame
+            
+        Returns:
+            SignificanceTests with one row per frame
+        """
+        return cls(
+            frames=np.array(frames, dtype=np.int64),
+            methods=np.array(methods, dtype=object),
+            statistics=np.array([r.statistic for r in results], dtype=np.float64),
+            p_values=np.array([r.p_value for r in results], dtype=np.float64),
+            effect_sizes=np.array([r.effect_size for r in results], dtype=np.float64),
+            is_significant=np.array([r.is_significant for r in results], dtype=bool),
+            results=list(results)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.frames)
+
 class VideoForensicsStatistics:
     """
     Statistically sound methods for video forensics analysis.
     
     This class implements proper statistical frameworks for detecting
     compression ratio discontinuities without inappropriate sigma claims.
+    
+    float32 compression ratios are scanned and resampled as float32; baseline
+    moments, detector accumulators and p-values are always float64.
     """
     
-    def __init__(self, significance_level: float = 0.05):
+    def __init__(self, significance_level: float = 0.05, random_seed: Optional[int] = None):
         """
         Initialize the statistical analysis framework.
         
         Args:
             significance_level: Alpha level for hypothesis testing (default: 0.05)
+            random_seed: Seed for the bootstrap resampling generator; None
+                draws fresh entropy
         """
         self.significance_level = significance_level
         self.baseline_frames = 1000  # Number of frames to use for baseline
+        self.bootstrap_block = 1000  # Resamples drawn per vectorized block
+        
+        # One generator shared by every bootstrap of this instance
+        self._rng = np.random.default_rng(random_seed)
         
-    def establish_baseline(self, compression_ratios: np.ndarray) -> Dict:
+        # Baseline statistics by baseline content, so repeated analyses of
+        # the same series skip the normality and autocorrelation tests
+        self._baseline_cache = {}
+        
+    def establish_baseline(self, compression_ratios: np.ndarray) -> BaselineStats:
         """
         Establish statistical baseline for compression ratios.
         
@@ -59,187 +450,316 @@ class VideoForensicsStatistics:
             compression_ratios: Array of compression ratios
             
         Returns:
-            Dictionary containing baseline statistics and properties
+            BaselineStats with the baseline statistics and properties
         """
         if len(compression_ratios) < self.baseline_frames:
             raise ValueError(f"Need at least {self.baseline_frames} frames for baseline")
             
-        baseline_data = compression_ratios[:self.baseline_frames]
+        baseline_data = np.asarray(compression_ratios[:self.baseline_frames])
         
-        # Test for normality
+        # Keyed by the baseline values themselves, so a reused or modified
+        # array buffer can never return stale statistics
+        cache_key = (self.baseline_frames, self.significance_level, baseline_data.dtype.str, baseline_data.tobytes())
+        cached = self._baseline_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Test for normality (Anderson-Darling is on demand via
+        # anderson_darling_test; only Shapiro-Wilk drives is_normal)
         shapiro_stat, shapiro_p = stats.shapiro(baseline_data)
-        anderson_stat, anderson_critical, anderson_significance = stats.anderson(baseline_data, dist='norm')
         
         # Calculate descriptive statistics
-        mean = np.mean(baseline_data)
-        std = np.std(baseline_data, ddof=1)  # Sample standard deviation
-        median = np.median(baseline_data)
-        mad = stats.median_abs_deviation(baseline_data)
-        
-        # Calculate percentiles
-        q25, q75 = np.percentile(baseline_data, [25, 75])
+        # Accumulated in float64 even for float32 series
+        mean = np.mean(baseline_data, dtype=np.float64)
+        std = np.std(baseline_data, ddof=1, dtype=np.float64)  # Sample standard deviation
+        # Quartiles from one partial selection; MAD around that median
+        q25, median, q75 = _quartiles(baseline_data)
+        mad = np.median(np.abs(baseline_data - median))
         iqr = q75 - q25
         
         # Test for autocorrelation
-        autocorr_lag1 = np.corrcoef(baseline_data[:-1], baseline_data[1:])[0, 1]
+        acf = self._autocorrelation(baseline_data, lags=10)
+        autocorr_lag1 = acf[1]
         
         # Ljung-Box test for autocorrelation
-        ljung_box_stat, ljung_box_p = self._ljung_box_test(baseline_data, lags=10)
-        
-        return {
-            'n_samples': len(baseline_data),
-            'mean': mean,
-            'std': std,
-            'median': median,
-            'mad': mad,
-            'q25': q25,
-            'q75': q75,
-            'iqr': iqr,
-            'min': np.min(baseline_data),
-            'max': np.max(baseline_data),
-            'skewness': stats.skew(baseline_data),
-            'kurtosis': stats.kurtosis(baseline_data),
-            'shapiro_stat': shapiro_stat,
-            'shapiro_p': shapiro_p,
-            'is_normal': shapiro_p > self.significance_level,
-            'anderson_stat': anderson_stat,
-            'anderson_critical_5pct': anderson_critical[2],  # 5% critical value
-            'autocorr_lag1': autocorr_lag1,
-            'ljung_box_stat': ljung_box_stat,
-            'ljung_box_p': ljung_box_p,
-            'has_autocorrelation': ljung_box_p < self.significance_level
-        }
+        ljung_box_stat, ljung_box_p = self._ljung_box_test(baseline_data, lags=10, acf=acf)
+        
+        baseline_stats = BaselineStats(
+            n_samples=len(baseline_data),
+            mean=mean,
+            std=std,
+            median=median,
+            mad=mad,
+            q25=q25,
+            q75=q75,
+            iqr=iqr,
+            min=np.min(baseline_data),
+            max=np.max(baseline_data),
+            skewness=stats.skew(baseline_data),
+            kurtosis=stats.kurtosis(baseline_data),
+            shapiro_stat=shapiro_stat,
+            shapiro_p=shapiro_p,
+            is_normal=shapiro_p > self.significance_level,
+            autocorr_lag1=autocorr_lag1,
+            ljung_box_stat=ljung_box_stat,
+            ljung_box_p=ljung_box_p,
+            has_autocorrelation=ljung_box_p < self.significance_level
+        )
+        self._baseline_cache[cache_key] = baseline_stats
+        return baseline_stats
+    
+    def anderson_darling_test(self, compression_ratios: np.ndarray) -> Tuple[float, float]:
+        """
+        Anderson-Darling normality test of the baseline period.
+        
+        Args:
+            compression_ratios: Array of compression ratios
+            
+        Returns:
+            Tuple of (statistic, critical_value_5pct)
+        """
+        baseline_data = np.asarray(compression_ratios[:self.baseline_frames])
+        anderson_stat, anderson_critical, anderson_significance = stats.anderson(baseline_data, dist='norm')
+        return anderson_stat, anderson_critical[2]  # 5% critical value
     
-    def _ljung_box_test(self, data: np.ndarray, lags: int = 10) -> Tuple[float, float]:
+    def _autocorrelation(self, data: np.ndarray, lags: int = 10) -> np.ndarray:
+        """
+        Sample autocorrelation function via FFT.
+        
+        Args:
+            data: Time series data
+            lags: Largest lag
+            
+        Returns:
+            Autocorrelations at lags 0..lags (0 beyond the series length)
+        """
+        n = len(data)
+        centered = np.asarray(data, dtype=np.float64) - np.mean(data)
+        
+        # Zero-padding to 2n makes the circular correlation linear
+        spectrum = np.fft.rfft(centered, n=2 * n)
+        acov = np.fft.irfft(spectrum * np.conj(spectrum), n=2 * n)[:min(lags, n - 1) + 1] / n
+        
+        acf = np.zeros(lags + 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            acf[:len(acov)] = acov / acov[0]
+        return acf
+    
+    def _ljung_box_test(self, data: np.ndarray, lags: int = 10,
+                        acf: Optional[np.ndarray] = None) -> Tuple[float, float]:
         """
         Ljung-Box test for autocorrelation.
         
         Args:
             data: Time series data
             lags: Number of lags to test
+            acf: Autocorrelations at lags 0..lags, when already computed
             
         Returns:
             Test statistic and p-value
         """
         n = len(data)
-        autocorrs = []
-        
-        for lag in range(1, lags + 1):
-            if lag < n:
-                autocorr = np.corrcoef(data[:-lag], data[lag:])[0, 1]
-                autocorrs.append(autocorr)
-            else:
-                autocorrs.append(0)
-        
-        autocorrs = np.array(autocorrs)
+        if acf is None:
+            acf = self._autocorrelation(data, lags)
         
         # Ljung-Box statistic
-        lb_stat = n * (n + 2) * np.sum([(autocorrs[i]**2) / (n - i - 1) for i in range(len(autocorrs))])
+        lb_stat = n * (n + 2) * np.sum(acf[1:lags + 1] ** 2 / (n - np.arange(1, lags + 1)))
         
-        # Chi-square test
-        p_value = 1 - stats.chi2.cdf(lb_stat, df=lags)
+        # Chi-square test (special.chdtr is the ufunc behind stats.chi2.cdf,
+        # without the distribution-object overhead)
+        p_value = 1 - special.chdtr(lags, lb_stat)
         
         return lb_stat, p_value
     
-    def detect_change_points_cusum(self, data: np.ndarray, threshold: float = 5.0) -> Tuple[List[int], np.ndarray, np.ndarray]:
+    def detect_change_points_cusum(self, data: np.ndarray, threshold: float = 5.0,
+                                   baseline_stats: Optional[BaselineStats] = None,
+                                   standardized: Optional[np.ndarray] = None) -> Tuple[List[int], np.ndarray, np.ndarray]:
         """
         Detect change points using CUSUM (Cumulative Sum) method.
         
         Args:
             data: Time series data
             threshold: Detection threshold
+            baseline_stats: Result of establish_baseline for data, when
+                already computed
+            standardized: Result of _standardize for data, when already
+                computed
             
         Returns:
             Tuple of (change_points, cusum_positive, cusum_negative)
         """
-        n = len(data)
-        baseline_stats = self.establish_baseline(data)
+        if baseline_stats is None:
+            baseline_stats = self.establish_baseline(data)
         
-        # Standardize data using baseline statistics
-        if baseline_stats['is_normal']:
-            standardized = (data - baseline_stats['mean']) / baseline_stats['std']
-        else:
-            # Use robust standardization for non-normal data
-            standardized = (data - baseline_stats['median']) / baseline_stats['mad']
+        if standardized is None:
+            standardized = self._standardize(data, baseline_stats)
         
         # CUSUM calculation
-        cusum_pos = np.zeros(n)
-        cusum_neg = np.zeros(n)
-        
-        for i in range(1, n):
-            cusum_pos[i] = max(0, cusum_pos[i-1] + standardized[i] - 0.5)
-            cusum_neg[i] = min(0, cusum_neg[i-1] + standardized[i] + 0.5)
+        cusum_pos, cusum_neg = _cusum_kernel(standardized, 0.5)
         
-        # Detect change points
-        change_points = []
-        for i in range(self.baseline_frames, n):  # Start after baseline period
-            if abs(cusum_pos[i]) > threshold or abs(cusum_neg[i]) > threshold:
-                change_points.append(i)
+        # Detect change points, starting after the baseline period (the
+        # positive sum is never negative and the negative sum never positive)
+        start = self.baseline_frames
+        exceeds = (cusum_pos[start:] > threshold) | (cusum_neg[start:] < -threshold)
+        change_points = (np.flatnonzero(exceeds) + start).tolist()
         
         return change_points, cusum_pos, cusum_neg
     
-    def bayesian_change_point_detection(self, data: np.ndarray, prior_prob: float = 1/250) -> Tuple[List[int], np.ndarray]:
+    def detect_change_points_focus(self, data: np.ndarray, threshold: float = 10.0,
+                                   baseline_stats: Optional[BaselineStats] = None,
+                                   standardized: Optional[np.ndarray] = None) -> Tuple[List[int], np.ndarray]:
         """
-        Bayesian online change point detection.
+        Detect change points using FOCuS (functional online CUSUM).
+        
+        Equivalent to running CUSUM for every possible change size at once:
+        the statistic at each frame is the largest log-likelihood ratio of a
+        mean shift from the baseline over all start frames and magnitudes, so
+        no reference value k has to be chosen per expected change size.
+        
+        The default threshold of 10 was set by simulation on change-free
+        standard normal series: it keeps the chance of any detection over
+        1000 frames (one baseline window) near 5%. The null maximum grows
+        with series length (about 47% false-alarm chance over 10,000
+        frames), so for a 5% rate over n frames use roughly 13 at n = 10,000
+        and 15 at n = 100,000.
         
         Args:
             data: Time series data
-            prior_prob: Prior probability of change point
+            threshold: Detection threshold on the log-likelihood ratio
+            baseline_stats: Result of establish_baseline for data, when
+                already computed
+            standardized: Result of _standardize for data, when already
+                computed
             
         Returns:
-            Tuple of (change_points, change_probabilities)
+            Tuple of (change_points, focus_statistic)
         """
-        n = len(data)
-        R = np.zeros((n + 1, n + 1))
-        R[0, 0] = 1
+        if baseline_stats is None:
+            baseline_stats = self.establish_baseline(data)
+        
+        if standardized is None:
+            standardized = self._standardize(data, baseline_stats)
+        
+        statistic = _focus_kernel(standardized)
         
-        change_points = []
-        change_probabilities = np.zeros(n)
+        # Detect change points, starting after the baseline period
+        start = self.baseline_frames
+        change_points = (np.flatnonzero(statistic[start:] > threshold) + start).tolist()
         
-        baseline_stats = self.establish_baseline(data)
+        return change_points, statistic
+    
+    @staticmethod
+    def _standardize(data: np.ndarray, baseline_stats: BaselineStats) -> np.ndarray:
+        """
+        Standardize data using baseline statistics.
         
-        for t in range(1, min(n + 1, self.baseline_frames + 1000)):  # Limit computation
-            # Predictive probabilities
-            pred_probs = np.zeros(t + 1)
+        Args:
+            data: Time series data
+            baseline_stats: Result of establish_baseline for data
             
-            for r in range(t):
-                if R[r, t-1] > 1e-10:  # Avoid numerical issues
-                    run_length = t - r
-                    if run_length > 1:
-                        data_subset = data[r:t]
-                        if len(data_subset) > 1:
-                            subset_mean = np.mean(data_subset)
-                            subset_std = np.std(data_subset, ddof=1)
-                            if subset_std > 0:
-                                pred_probs[r] = stats.norm.pdf(data[t-1], subset_mean, subset_std)
+        Returns:
+            Standardized series, float32 for float32 data and float64 otherwise
+        """
+        data = np.asarray(data)
+        dtype = _working_dtype(data)
+        
+        if baseline_stats.is_normal:
+            center, scale = baseline_stats.mean, baseline_stats.std
+        else:
+            # Use robust standardization for non-normal data
+            center, scale = baseline_stats.median, baseline_stats.mad
+        
+        return (data.astype(dtype, copy=False) - dtype(center)) / dtype(scale)
+    
+    def bayesian_change_point_detection(self, data: np.ndarray, prior_prob: float = 1/250,
+                                        prune_threshold: float = 1e-4,
+                                        baseline_stats: Optional[BaselineStats] = None) -> Tuple[List[int], np.ndarray]:
+        """
+        Bayesian online change point detection (Adams & MacKay).
+        
+        Keeps the posterior over the current run length (frames since the
+        last change) as one vector that grows by a frame per step. Each run's
+        Normal-Inverse-Gamma posterior, centred on the baseline mean and
+        variance, is read off prefix sums of the series, so no run is ever
+        re-sliced or re-summed. Run lengths whose posterior probability
+        drops below prune_threshold are dropped. At the default 1e-4 at most
+        a few hundred runs stay live on stationary data however long the
+        series, so the whole series is processed in near-linear time; much
+        smaller thresholds keep most run lengths alive and the recursion
+        degrades towards O(n^2). The recursion runs in _bocpd_kernel.
+        
+        Args:
+            data: Time series data
+            prior_prob: Prior probability of change point (constant hazard)
+            prune_threshold: Posterior probability below which a run length
+                is discarded
+            baseline_stats: Result of establish_baseline for data, when
+                already computed
             
-            # Update run length distribution
-            if np.sum(pred_probs) > 0:
-                R[1:t+1, t] = R[0:t, t-1] * pred_probs[0:t] * (1 - prior_prob)
-                R[0, t] = np.sum(R[0:t, t-1] * pred_probs[0:t] * prior_prob)
-                
-                # Normalize
-                total = np.sum(R[:, t])
-                if total > 0:
-                    R[:, t] = R[:, t] / total
-                
-                # Store change probability
-                if t <= n:
-                    change_probabilities[t-1] = R[0, t]
-                
-                # Check for change point
-                if R[0, t] > 0.5 and t > self.baseline_frames:
-                    change_points.append(t-1)
+        Returns:
+            Tuple of (change_points, change_probabilities), where
+            change_probabilities[i] is the posterior probability that a new
+            segment starts at frame i
+        """
+        if baseline_stats is None:
+            baseline_stats = self.establish_baseline(data)
+        
+        change_probabilities, _ = self._bocpd_posterior(data, prior_prob, prune_threshold, baseline_stats)
+        
+        # Detect change points, starting after the baseline period
+        start = self.baseline_frames
+        change_points = (np.flatnonzero(change_probabilities[start:] > 0.5) + start).tolist()
         
         return change_points, change_probabilities
     
-    def test_compression_anomaly(self, compression_ratios: np.ndarray, anomaly_frame: int) -> StatisticalResult:
+    def _bocpd_posterior(self, data: np.ndarray, prior_prob: float, prune_threshold: float,
+                         baseline_stats: BaselineStats) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run the BOCPD recursion for bayesian_change_point_detection.
+        
+        Args:
+            data: Time series data
+            prior_prob: Prior probability of change point (constant hazard)
+            prune_threshold: Posterior probability below which a run length
+                is discarded
+            baseline_stats: Result of establish_baseline for data
+            
+        Returns:
+            Tuple of (change_probabilities, run_counts), where run_counts[i]
+            is the number of run lengths still live after frame i
+        """
+        n = len(data)
+        data = np.asarray(data)
+        data = data.astype(_working_dtype(data), copy=False)
+        
+        # Normal-Inverse-Gamma prior; a flat baseline falls back to unit scale
+        mu0 = baseline_stats.mean
+        kappa0 = 1.0
+        alpha0 = 1.0
+        beta0 = baseline_stats.std ** 2 or 1.0
+        
+        # Student-t normalizing constant for each run length L, whose
+        # posterior shape is alpha0 + L / 2
+        alphas = alpha0 + 0.5 * np.arange(n + 1)
+        log_norm = special.gammaln(alphas + 0.5) - special.gammaln(alphas) - 0.5 * np.log(2.0 * np.pi * alphas)
+        
+        # Centring on the prior mean keeps the kernel's running sums of
+        # squares well conditioned
+        return _bocpd_kernel(
+            data - data.dtype.type(mu0), log_norm, kappa0, alpha0, beta0,
+            np.log(prior_prob), np.log1p(-prior_prob), np.log(prune_threshold)
+        )
+    
+    def test_compression_anomaly(self, compression_ratios: np.ndarray, anomaly_frame: int,
+                                 baseline_stats: Optional[BaselineStats] = None) -> StatisticalResult:
         """
         Perform proper statistical significance testing for compression anomaly.
         
         Args:
             compression_ratios: Array of compression ratios
             anomaly_frame: Frame index of suspected anomaly
+            baseline_stats: Result of establish_baseline for
+                compression_ratios, when already computed
             
         Returns:
             StatisticalResult object with complete analysis
@@ -248,52 +768,54 @@ class VideoForensicsStatistics:
             raise ValueError("Anomaly frame index out of bounds")
         
         # Establish baseline
-        baseline_stats = self.establish_baseline(compression_ratios)
+        if baseline_stats is None:
+            baseline_stats = self.establish_baseline(compression_ratios)
         baseline_data = compression_ratios[:self.baseline_frames]
         anomaly_value = compression_ratios[anomaly_frame]
         
         # Check assumptions
         assumptions_met = {
-            'normality': baseline_stats['is_normal'],
-            'independence': not baseline_stats['has_autocorrelation'],
-            'sufficient_sample_size': baseline_stats['n_samples'] >= 30
+            'normality': baseline_stats.is_normal,
+            'independence': not baseline_stats.has_autocorrelation,
+            'sufficient_sample_size': baseline_stats.n_samples >= 30
         }
         
         # Choose appropriate test based on assumptions
-        if baseline_stats['is_normal'] and assumptions_met['independence']:
+        if baseline_stats.is_normal and assumptions_met['independence']:
             # Use parametric Z-test
-            z_score = (anomaly_value - baseline_stats['mean']) / baseline_stats['std']
-            p_value = 2 * (1 - stats.norm.cdf(abs(z_score)))  # Two-tailed test
+            z_score = (anomaly_value - baseline_stats.mean) / baseline_stats.std
+            p_value = 2 * (1 - special.ndtr(abs(z_score)))  # Two-tailed test
             test_type = "Z-test (parametric)"
             statistic = z_score
             
         else:
             # Use robust non-parametric approach
             # Modified Z-score using median and MAD
-            modified_z = 0.6745 * (anomaly_value - baseline_stats['median']) / baseline_stats['mad']
+            modified_z = 0.6745 * (anomaly_value - baseline_stats.median) / baseline_stats.mad
             
-            # Bootstrap for p-value calculation
+            # Bootstrap for p-value calculation: the modified Z-score of one
+            # random element of each resample, against that resample's
+            # median and MAD
             n_bootstrap = 10000
             bootstrap_stats = []
             
-            for _ in range(n_bootstrap):
-                bootstrap_sample = np.random.choice(baseline_data, size=len(baseline_data), replace=True)
-                bootstrap_median = np.median(bootstrap_sample)
-                bootstrap_mad = stats.median_abs_deviation(bootstrap_sample)
-                if bootstrap_mad > 0:
-                    bootstrap_z = 0.6745 * (np.random.choice(bootstrap_sample) - bootstrap_median) / bootstrap_mad
-                    bootstrap_stats.append(abs(bootstrap_z))
+            for samples in self._bootstrap_resamples(baseline_data, n_bootstrap):
+                bootstrap_medians, bootstrap_mads = _median_mad(samples)
+                picks = samples[np.arange(len(samples)), self._rng.integers(0, samples.shape[1], len(samples))]
+                valid = bootstrap_mads > 0
+                bootstrap_z = 0.6745 * (picks[valid] - bootstrap_medians[valid]) / bootstrap_mads[valid]
+                bootstrap_stats.append(np.abs(bootstrap_z))
             
-            p_value = np.mean(np.array(bootstrap_stats) >= abs(modified_z))
+            p_value = np.mean(np.concatenate(bootstrap_stats) >= abs(modified_z))
             test_type = "Modified Z-test with bootstrap (non-parametric)"
             statistic = modified_z
         
         # Calculate effect size (Cohen's d)
-        if baseline_stats['is_normal']:
-            cohens_d = (anomaly_value - baseline_stats['mean']) / baseline_stats['std']
+        if baseline_stats.is_normal:
+            cohens_d = (anomaly_value - baseline_stats.mean) / baseline_stats.std
         else:
             # Robust effect size using MAD
-            cohens_d = (anomaly_value - baseline_stats['median']) / baseline_stats['mad']
+            cohens_d = (anomaly_value - baseline_stats.median) / baseline_stats.mad
         
         # Interpret effect size
         if abs(cohens_d) < 0.2:
@@ -308,22 +830,17 @@ class VideoForensicsStatistics:
         # Calculate confidence interval for effect size
         # Using bootstrap for robust CI
         bootstrap_effects = []
-        for _ in range(1000):
-            bootstrap_sample = np.random.choice(baseline_data, size=len(baseline_data), replace=True)
-            if baseline_stats['is_normal']:
-                boot_mean = np.mean(bootstrap_sample)
-                boot_std = np.std(bootstrap_sample, ddof=1)
-                if boot_std > 0:
-                    boot_effect = (anomaly_value - boot_mean) / boot_std
-                    bootstrap_effects.append(boot_effect)
+        for samples in self._bootstrap_resamples(baseline_data, 1000):
+            if baseline_stats.is_normal:
+                centers = samples.mean(axis=1)
+                scales = samples.std(axis=1, ddof=1)
             else:
-                boot_median = np.median(bootstrap_sample)
-                boot_mad = stats.median_abs_deviation(bootstrap_sample)
-                if boot_mad > 0:
-                    boot_effect = (anomaly_value - boot_median) / boot_mad
-                    bootstrap_effects.append(boot_effect)
+                centers, scales = _median_mad(samples)
+            valid = scales > 0
+            bootstrap_effects.append((anomaly_value - centers[valid]) / scales[valid])
+        bootstrap_effects = np.concatenate(bootstrap_effects)
         
-        if bootstrap_effects:
+        if bootstrap_effects.size:
             ci_lower = np.percentile(bootstrap_effects, 2.5)
             ci_upper = np.percentile(bootstrap_effects, 97.5)
             confidence_interval = (ci_lower, ci_upper)
@@ -338,7 +855,7 @@ class VideoForensicsStatistics:
             limitations.append("Data shows significant autocorrelation")
         if anomaly_frame < self.baseline_frames * 2:
             limitations.append("Anomaly occurs too close to baseline period")
-        if baseline_stats['std'] == 0 or baseline_stats['mad'] == 0:
+        if baseline_stats.std == 0 or baseline_stats.mad == 0:
             limitations.append("Baseline shows no variation")
         
         return StatisticalResult(
@@ -354,6 +871,23 @@ class VideoForensicsStatistics:
             limitations=limitations
         )
     
+    def _bootstrap_resamples(self, data: np.ndarray, n_resamples: int):
+        """
+        Bootstrap resamples of data as matrices, one resample per row.
+        
+        Args:
+            data: Sample to resample with replacement
+            n_resamples: Total number of resamples
+            
+        Yields:
+            (rows, len(data)) arrays of at most bootstrap_block rows, which
+            bounds memory while keeping every reduction vectorized
+        """
+        data = np.asarray(data)
+        for start in range(0, n_resamples, self.bootstrap_block):
+            rows = min(self.bootstrap_block, n_resamples - start)
+            yield data[self._rng.integers(0, len(data), size=(rows, len(data)))]
+    
     def comprehensive_analysis(self, compression_ratios: np.ndarray) -> Dict:
         """
         Perform comprehensive statistical analysis of compression ratios.
@@ -366,44 +900,53 @@ class VideoForensicsStatistics:
         """
         results = {}
         
-        # Establish baseline
-        results['baseline'] = self.establish_baseline(compression_ratios)
+        # Establish baseline once; every method below reuses it
+        results['baseline'] = baseline_stats = self.establish_baseline(compression_ratios)
         
-        # Change point detection
-        cusum_points, cusum_pos, cusum_neg = self.detect_change_points_cusum(compression_ratios)
+        # Change point detection; standardized once for both CUSUM-family
+        # detectors
+        standardized = self._standardize(compression_ratios, baseline_stats)
+        
+        cusum_points, cusum_pos, cusum_neg = self.detect_change_points_cusum(
+            compression_ratios, baseline_stats=baseline_stats, standardized=standardized
+        )
         results['cusum_change_points'] = cusum_points
         results['cusum_statistics'] = {
             'positive': cusum_pos,
             'negative': cusum_neg
         }
         
+        # FOCuS change point detection (all change sizes at once)
+        focus_points, focus_statistic = self.detect_change_points_focus(
+            compression_ratios, baseline_stats=baseline_stats, standardized=standardized
+        )
+        results['focus_change_points'] = focus_points
+        results['focus_statistic'] = focus_statistic
+        
         # Bayesian change point detection
-        bayes_points, bayes_probs = self.bayesian_change_point_detection(compression_ratios)
+        bayes_points, bayes_probs = self.bayesian_change_point_detection(compression_ratios, baseline_stats=baseline_stats)
         results['bayesian_change_points'] = bayes_points
         results['bayesian_probabilities'] = bayes_probs
         
         # Statistical testing for detected change points
-        results['significance_tests'] = []
+        tested_frames, methods, test_results = [], [], []
         
         # Test CUSUM detected points
         for point in cusum_points[:5]:  # Limit to first 5 points
             if point < len(compression_ratios):
-                test_result = self.test_compression_anomaly(compression_ratios, point)
-                results['significance_tests'].append({
-                    'frame': point,
-                    'method': 'CUSUM',
-                    'result': test_result
-                })
-        
-        # Test Bayesian detected points
+                tested_frames.append(point)
+                methods.append('CUSUM')
+                test_results.append(self.test_compression_anomaly(compression_ratios, point, baseline_stats))
+        
+        # Test Bayesian detected points not already flagged by CUSUM
+        cusum_set = set(cusum_points)
         for point in bayes_points[:5]:  # Limit to first 5 points
-            if point < len(compression_ratios) and point not in cusum_points:
-                test_result = self.test_compression_anomaly(compression_ratios, point)
-                results['significance_tests'].append({
-                    'frame': point,
-                    'method': 'Bayesian',
-                    'result': test_result
-                })
+            if point < len(compression_ratios) and point not in cusum_set:
+                tested_frames.append(point)
+                methods.append('Bayesian')
+                test_results.append(self.test_compression_anomaly(compression_ratios, point, baseline_stats))
+        
+        results['significance_tests'] = SignificanceTests.from_results(tested_frames, methods, test_results)
         
         return results
     
@@ -425,15 +968,15 @@ class VideoForensicsStatistics:
         # Baseline properties
         baseline = analysis_results['baseline']
         report.append("BASELINE PROPERTIES:")
-        report.append(f"  Sample size: {baseline['n_samples']}")
-        report.append(f"  Mean: {baseline['mean']:.4f}")
-        report.append(f"  Standard deviation: {baseline['std']:.4f}")
-        report.append(f"  Median: {baseline['median']:.4f}")
-        report.append(f"  MAD: {baseline['mad']:.4f}")
-        report.append(f"  Normality (Shapiro-Wilk p-value): {baseline['shapiro_p']:.6f}")
-        report.append(f"  Is normal: {baseline['is_normal']}")
-        report.append(f"  Autocorrelation (lag-1): {baseline['autocorr_lag1']:.4f}")
-        report.append(f"  Has autocorrelation: {baseline['has_autocorrelation']}")
+        report.append(f"  Sample size: {baseline.n_samples}")
+        report.append(f"  Mean: {baseline.mean:.4f}")
+        report.append(f"  Standard deviation: {baseline.std:.4f}")
+        report.append(f"  Median: {baseline.median:.4f}")
+        report.append(f"  MAD: {baseline.mad:.4f}")
+        report.append(f"  Normality (Shapiro-Wilk p-value): {baseline.shapiro_p:.6f}")
+        report.append(f"  Is normal: {baseline.is_normal}")
+        report.append(f"  Autocorrelation (lag-1): {baseline.autocorr_lag1:.4f}")
+        report.append(f"  Has autocorrelation: {baseline.has_autocorrelation}")
         report.append("")
         
         # Change point detection
@@ -442,6 +985,10 @@ class VideoForensicsStatistics:
         if analysis_results['cusum_change_points']:
             report.append(f"    Frames: {analysis_results['cusum_change_points'][:10]}")  # Show first 10
         
+        report.append(f"  FOCuS detected points: {len(analysis_results['focus_change_points'])}")
+        if analysis_results['focus_change_points']:
+            report.append(f"    Frames: {analysis_results['focus_change_points'][:10]}")  # Show first 10
+        
         report.append(f"  Bayesian detected points: {len(analysis_results['bayesian_change_points'])}")
         if analysis_results['bayesian_change_points']:
             report.append(f"    Frames: {analysis_results['bayesian_change_points'][:10]}")  # Show first 10
@@ -449,9 +996,9 @@ class VideoForensicsStatistics:
         
         # Significance tests
         report.append("SIGNIFICANCE TESTING:")
-        for i, test in enumerate(analysis_results['significance_tests']):
-            result = test['result']
-            report.append(f"  Test {i+1} - Frame {test['frame']} ({test['method']}):")
+        tests = analysis_results['significance_tests']
+        for i, (frame, method, result) in enumerate(zip(tests.frames, tests.methods, tests.results)):
+            report.append(f"  Test {i+1} - Frame {frame} ({method}):")
             report.append(f"    Test type: {result.test_type}")
             report.append(f"    Statistic: {result.statistic:.4f}")
             report.append(f"    P-value: {result.p_value:.6f}")
@@ -470,22 +1017,22 @@ def main():
     Example usage of the corrected statistical analysis.
     """
     # Generate example data with a change point
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     # Baseline data (normal compression ratios)
-    baseline = np.random.normal(15, 2, 1000)
+    baseline = rng.normal(15, 2, 1000)
     
     # Anomaly data (sudden spike)
     anomaly_section = np.array([85, 87, 83, 89, 86])  # 5 frames of high compression
     
     # Return to baseline
-    post_anomaly = np.random.normal(15.5, 2.1, 500)
+    post_anomaly = rng.normal(15.5, 2.1, 500)
     
     # Combine data
     compression_ratios = np.concatenate([baseline, anomaly_section, post_anomaly])
     
     # Perform analysis
-    analyzer = VideoForensicsStatistics()
+    analyzer = VideoForensicsStatistics(random_seed=42)
     results = analyzer.comprehensive_analysis(compression_ratios)
     
     # Generate report
@@ -111,6 +111,13 @@ class EnhancedVideoAnalyzer:
         }
         logger.info(f"Initialized {len(self.analyzers)} analysis modules")
     
+    def close(self):
+        """Release worker pools held by the analysis modules."""
+        for analyzer in self.analyzers.values():
+            close = getattr(analyzer, 'close', None)
+            if close is not None:
+                close()
+    
     def analyze_video(self, progress_callback=None) -> Dict[str, Any]:
         """
         Perform comprehensive video analysis.
@@ -500,6 +507,9 @@ def main():
     except Exception as e:
         print(f"\nError during analysis: {e}")
         sys.exit(1)
+    
+    finally:
+        analyzer.close()
 
 if __name__ == "__main__":
     main()
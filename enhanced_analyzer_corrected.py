@@ -621,7 +621,7 @@ class EnhancedVideoAnalyzer:
             'analysis_timestamp': datetime.now().isoformat(),
             'video_file': self.video_path,
             'methodology': 'Corrected Statistical Analysis',
-            'baseline_properties': self.stats_analyzer.establish_baseline(np.array(self.compression_ratios)) if self.compression_ratios else {},
+            'baseline_properties': self.stats_analyzer.establish_baseline(np.array(self.compression_ratios)).to_dict() if self.compression_ratios else {},
             'splice_evidence': [
                 {
                     'start_time': e.start_time,
@@ -14,7 +14,7 @@ Date: January 2025
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from corrected_statistical_analysis import VideoForensicsStatistics
+from corrected_statistical_analysis import VideoForensicsStatistics, _focus_kernel
 import json
 import os
 
@@ -124,6 +124,63 @@ def test_statistical_methods():
     
     return results, test_result
 
+def test_bocpd_run_count_bounded():
+    """BOCPD pruning keeps the live run lengths bounded on stationary data."""
+    analyzer = VideoForensicsStatistics()
+    
+    max_runs = {}
+    for n_frames in (5000, 20000):
+        data = np.random.default_rng(3).normal(15, 2, n_frames)
+        baseline_stats = analyzer.establish_baseline(data)
+        _, run_counts = analyzer._bocpd_posterior(data, 1/250, 1e-4, baseline_stats)
+        max_runs[n_frames] = run_counts.max()
+    
+    # Near-linear: the live set does not grow with the series length
+    assert max_runs[20000] < 1000
+    assert max_runs[20000] < 2 * max_runs[5000]
+
+def test_baseline_stats_dict_access():
+    """BaselineStats key access covers its fields only, like the former dict."""
+    analyzer = VideoForensicsStatistics()
+    baseline_stats = analyzer.establish_baseline(np.random.default_rng(4).normal(15, 2, 1000))
+    
+    assert baseline_stats['mean'] == baseline_stats.mean
+    assert baseline_stats.get('std') == baseline_stats.std
+    assert baseline_stats.to_dict()['iqr'] == baseline_stats['iqr']
+    
+    for key in ('to_dict', 'get', '__class__', 'missing'):
+        try:
+            baseline_stats[key]
+        except KeyError:
+            pass
+        else:
+            raise AssertionError(f"{key!r} should not be a key")
+        assert baseline_stats.get(key, 'default') == 'default'
+
+def test_focus_matches_brute_force():
+    """FOCuS hull pruning gives the exhaustive maximum over start frames."""
+    analyzer = VideoForensicsStatistics()
+    rng = np.random.default_rng(5)
+    
+    for n_frames, shift in ((1, 0.0), (2, 0.0), (60, 0.0), (300, 0.8), (300, -1.5)):
+        data = rng.normal(0, 1, n_frames)
+        data[n_frames // 2:] += shift
+        cumsum = np.concatenate(([0.0], np.cumsum(data)))
+        
+        # max over tau < t of (S_t - S_tau)^2 / (2 (t - tau))
+        expected = np.array([
+            max((cumsum[t] - cumsum[tau]) ** 2 / (2 * (t - tau)) for tau in range(t))
+            for t in range(1, n_frames + 1)
+        ])
+        
+        np.testing.assert_allclose(_focus_kernel(data), expected, rtol=1e-9, atol=1e-12)
+    
+    # A clear shift after the baseline window is detected at the default threshold
+    data = rng.normal(15, 2, 2000)
+    data[1500:] += 3
+    change_points, _ = analyzer.detect_change_points_focus(data)
+    assert change_points and 1500 <= change_points[0] < 1520
+
 def create_visualization(compression_ratios, results, test_result, output_dir="test_output"):
     """Create visualizations of the corrected analysis."""
     
@@ -190,16 +247,16 @@ def create_visualization(compression_ratios, results, test_result, output_dir="t
     # Create a summary of statistical results
     significance_tests = results.get('significance_tests', [])
     if significance_tests:
-        frames_tested = [test['frame'] for test in significance_tests]
-        p_values = [test['result'].p_value for test in significance_tests]
-        effect_sizes = [abs(test['result'].effect_size) for test in significance_tests]
+        frames_tested = significance_tests.frames
+        p_values = significance_tests.p_values
+        effect_sizes = np.abs(significance_tests.effect_sizes)
         
         # Plot p-values
         ax4_twin = ax4.twinx()
         
-        bars1 = ax4.bar([f - 0.2 for f in frames_tested], p_values, width=0.4, 
+        bars1 = ax4.bar(frames_tested - 0.2, p_values, width=0.4, 
                        alpha=0.7, color='lightcoral', label='P-values')
-        bars2 = ax4_twin.bar([f + 0.2 for f in frames_tested], effect_sizes, width=0.4, 
+        bars2 = ax4_twin.bar(frames_tested + 0.2, effect_sizes, width=0.4, 
                             alpha=0.7, color='lightblue', label='Effect Sizes')
         
         ax4.axhline(y=0.05, color='red', linestyle='--', alpha=0.7, label='α = 0.05')
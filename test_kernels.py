@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Compiled Kernel Tests
+=====================
+
+Checks each compiled kernel in analysis_modules._kernels against the
+NumPy/OpenCV/scikit-image computation it replaces, on random inputs with
+odd shapes so partial blocks and image borders are exercised.
+"""
+
+import math
+import unittest
+
+import cv2
+import numpy as np
+
+from analysis_modules._kernels import (
+    DCT8, DCT8_T, HIGHPASS_MAX, LBP8_OFFSETS, LBP8_UNIFORM_BIN,
+    block_stats, direction_consistency, entropy_u8, flow_stats, glcm4,
+    highpass_hist, lbp_uniform_hist, masked_sobel_stats
+)
+
+class TestKernels(unittest.TestCase):
+    """Compiled kernels against their reference implementations."""
+
+    def setUp(self):
+        """Set up random test inputs."""
+        self.rng = np.random.default_rng(7)
+        self.gray = self.rng.integers(0, 256, (37, 53), dtype=np.uint8)
+
+    def test_entropy_matches_numpy(self):
+        """Histogram entropy should match the NumPy formula."""
+        hist = self.rng.random(256).astype(np.float32)
+        hist[::7] = 0
+        hist /= hist.sum()
+
+        p = hist[hist > 1e-10].astype(np.float64)
+        expected = -np.sum(p * np.log2(p))
+
+        self.assertAlmostEqual(entropy_u8(hist), expected, places=5)
+
+    def test_dct8_basis_is_orthonormal(self):
+        """The shared DCT basis should be orthonormal and match cv2.dct."""
+        np.testing.assert_allclose(DCT8 @ DCT8_T, np.eye(8), atol=1e-6)
+
+        block = self.rng.random((8, 8)).astype(np.float32)
+        np.testing.assert_allclose(DCT8 @ block @ DCT8_T, cv2.dct(block), atol=1e-5)
+
+    def test_block_stats_matches_cv2_dct(self):
+        """Block DCT statistics should match per-block cv2.dct."""
+        n_rows, n_cols = self.gray.shape[0] // 8, self.gray.shape[1] // 8
+        dc, ac_energy = [], []
+        for row in range(n_rows):
+            for col in range(n_cols):
+                block = self.gray[row * 8:(row + 1) * 8, col * 8:(col + 1) * 8].astype(np.float32)
+                coefficients = cv2.dct(block).astype(np.float64)
+                dc.append(coefficients[0, 0])
+                ac_energy.append(np.sum(coefficients ** 2) - coefficients[0, 0] ** 2)
+
+        dc_variance, ac_mean, ac_std = block_stats(self.gray, DCT8)
+
+        np.testing.assert_allclose(
+            (dc_variance, ac_mean, ac_std), (np.var(dc), np.mean(ac_energy), np.std(ac_energy)), rtol=1e-4
+        )
+        self.assertTrue(np.isnan(block_stats(self.gray[:7], DCT8)[0]))
+
+    def test_masked_sobel_stats_matches_cv2_sobel(self):
+        """Masked gradient statistics should match cv2.Sobel, borders included."""
+        mask = (self.rng.random(self.gray.shape) < 0.3).astype(np.uint8)
+        mask[0, :] = 1
+        mask[:, -1] = 1
+
+        grad_x = cv2.Sobel(self.gray, cv2.CV_64F, 1, 0, ksize=3)
+        grad_y = cv2.Sobel(self.gray, cv2.CV_64F, 0, 1, ksize=3)
+        magnitude = np.sqrt(grad_x ** 2 + grad_y ** 2)[mask > 0]
+
+        count, mean, std = masked_sobel_stats(self.gray, mask)
+
+        self.assertEqual(count, magnitude.size)
+        np.testing.assert_allclose((mean, std), (magnitude.mean(), magnitude.std()), rtol=1e-9)
+        self.assertEqual(masked_sobel_stats(self.gray, np.zeros_like(mask))[0], 0)
+
+    def test_glcm4_matches_graycomatrix(self):
+        """Co-occurrence counts should match scikit-image's symmetric GLCM."""
+        from skimage.feature import graycomatrix
+
+        levels = 8
+        quantized = (self.gray // (256 // levels)).astype(np.uint8)
+        expected = graycomatrix(
+            quantized, [1], [0, np.pi / 4, np.pi / 2, 3 * np.pi / 4], levels=levels, symmetric=True
+        )[:, :, 0, :]
+
+        np.testing.assert_array_equal(glcm4(quantized, levels), np.moveaxis(expected, -1, 0))
+
+    def test_lbp_uniform_hist_matches_numpy(self):
+        """Uniform LBP counts should match a vectorized code computation."""
+        h, w = self.gray.shape
+        center = self.gray[1:-1, 1:-1]
+        codes = np.zeros(center.shape, dtype=np.uint8)
+        for k, (dy, dx) in enumerate(LBP8_OFFSETS):
+            neighbour = self.gray[1 + dy:h - 1 + dy, 1 + dx:w - 1 + dx]
+            codes |= (neighbour >= center).astype(np.uint8) << k
+        expected = np.bincount(LBP8_UNIFORM_BIN[codes].ravel(), minlength=10)
+
+        np.testing.assert_array_equal(lbp_uniform_hist(self.gray), expected)
+
+    def test_lbp_uniform_bins(self):
+        """Uniform bins should be rotation invariant with P * (P - 1) + 2 uniform codes."""
+        codes = np.arange(256)
+        rotated = ((codes << 1) | (codes >> 7)) & 0xFF
+
+        np.testing.assert_array_equal(LBP8_UNIFORM_BIN[rotated], LBP8_UNIFORM_BIN)
+        self.assertEqual(np.count_nonzero(LBP8_UNIFORM_BIN < 9), 8 * 7 + 2)
+        self.assertEqual(LBP8_UNIFORM_BIN[0], 0)
+        self.assertEqual(LBP8_UNIFORM_BIN[255], 8)
+        self.assertEqual(LBP8_UNIFORM_BIN[0b01010101], 9)
+
+    def test_highpass_hist_matches_filter2d(self):
+        """High-pass response counts should match cv2.filter2D."""
+        kernel = -np.ones((3, 3), dtype=np.float32)
+        kernel[1, 1] = 8
+        response = cv2.filter2D(self.gray, cv2.CV_32F, kernel).astype(np.int64)
+        expected = np.bincount((response + HIGHPASS_MAX).ravel(), minlength=2 * HIGHPASS_MAX + 1)
+
+        np.testing.assert_array_equal(highpass_hist(self.gray), expected)
+
+    def test_flow_stats_matches_numpy(self):
+        """Dense flow statistics should match the masked NumPy computation."""
+        flow = self.rng.normal(0, 2, (31, 45, 2)).astype(np.float32)
+        scale, threshold = 2.0, 1.5
+
+        fx, fy = flow[..., 0].astype(np.float64), flow[..., 1].astype(np.float64)
+        length = np.hypot(fx, fy)
+        significant = length * scale > threshold
+        magnitude = length[significant] * scale
+        angle = np.arctan2(fy[significant], fx[significant])
+
+        count, mean, std, mean_cos, mean_sin = flow_stats(flow, scale, threshold)
+
+        self.assertEqual(count, magnitude.size)
+        np.testing.assert_allclose(
+            (mean, std, mean_cos, mean_sin),
+            (magnitude.mean(), magnitude.std(), np.cos(angle).mean(), np.sin(angle).mean()),
+            rtol=1e-9, atol=1e-12
+        )
+        self.assertEqual(flow_stats(flow, scale, 1e9)[0], 0)
+
+    def test_direction_consistency_matches_numpy(self):
+        """Resultant length should match the NumPy mean unit vector."""
+        angles = self.rng.vonmises(0.5, 2.0, 500).astype(np.float32)
+        expected = np.hypot(np.cos(angles.astype(np.float64)).mean(), np.sin(angles.astype(np.float64)).mean())
+
+        self.assertAlmostEqual(direction_consistency(angles), expected, places=6)
+        self.assertAlmostEqual(direction_consistency(np.full(10, math.pi / 3, dtype=np.float32)), 1.0, places=6)
+
+if __name__ == "__main__":
+    unittest.main()